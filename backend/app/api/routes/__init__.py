@@ -1,8 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.routes import posts, tokens, users
+from app.api.routes import exports, images, posts, profiles, tokens, users
 
 router = APIRouter()
 router.include_router(users.router, prefix="/users", tags=["Users"])
 router.include_router(posts.router, prefix="/posts", tags=["Posts"])
 router.include_router(tokens.router, prefix="/tokens", tags=["Tokens"])
+router.include_router(images.router, prefix="/images", tags=["Images"])
+router.include_router(profiles.router, prefix="/profiles", tags=["Profiles"])
+router.include_router(exports.router, prefix="/exports", tags=["Exports"])
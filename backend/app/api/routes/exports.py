@@ -0,0 +1,65 @@
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
+
+from app.core.exports import MEDIA_TYPES, ExportFormat, ExportResponse, export_limiter, stream_export
+from app.deps import current_admin_dep
+from app.models import Category, Post, Tag, User, posts_tags
+
+router = APIRouter()
+
+
+def _export_response(stmt: Select, name: str, fmt: ExportFormat) -> StreamingResponse:
+    filename = f"{name}-{time.strftime('%Y%m%d%H%M%S')}.{fmt}"
+    export_limiter.acquire()
+    return ExportResponse(
+        stream_export(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/users", response_class=StreamingResponse)
+async def export_users(
+    _current_user: current_admin_dep,
+    fmt: Annotated[ExportFormat, Query(alias="format", description="导出格式")] = "ndjson",
+) -> StreamingResponse:
+    """导出全部用户（流式输出，不含密码哈希）"""
+    stmt = select(
+        User.id, User.username, User.email, User.avatar, User.power, User.created_at, User.updated_at
+    ).order_by(User.id)
+    return _export_response(stmt, "users", fmt)
+
+
+@router.get("/posts", response_class=StreamingResponse)
+async def export_posts(
+    _current_user: current_admin_dep,
+    fmt: Annotated[ExportFormat, Query(alias="format", description="导出格式")] = "ndjson",
+) -> StreamingResponse:
+    """导出全部文章（流式输出，标签以 `|` 分隔，可直接用于批量导入）"""
+    tags = (
+        select(func.aggregate_strings(Tag.name, "|"))
+        .join(posts_tags, posts_tags.c.tag_id == Tag.id)
+        .where(posts_tags.c.post_id == Post.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Post.id,
+            Post.title,
+            Post.content,
+            Post.author_id,
+            User.username.label("author"),
+            Category.name.label("category"),
+            tags.label("tags"),
+            Post.created_at,
+            Post.updated_at,
+        )
+        .join(User, User.id == Post.author_id)
+        .outerjoin(Category, Category.id == Post.category_id)
+        .order_by(Post.id)
+    )
+    return _export_response(stmt, "posts", fmt)
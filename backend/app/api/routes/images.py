@@ -0,0 +1,48 @@
+import os
+from typing import Annotated, Literal
+
+import anyio
+from fastapi import APIRouter, Header, Path, Query
+from fastapi.responses import FileResponse, Response
+
+from app import settings
+from app.core import exceptions
+from app.core.images import get_image_variant, render_image_variant, supported_formats
+from app.core.static import StaticFileResponse
+
+router = APIRouter()
+
+
+@router.get("/avatars/{id}/{filename}", response_class=FileResponse)
+async def read_avatar_image(
+    id: Annotated[int, Path(ge=1, description="用户 ID")],
+    filename: Annotated[str, Path(pattern=r"^\d+_[0-9a-f]{32}\.webp$", description="头像文件名")],
+    w: Annotated[int, Query(description="宽度（像素），仅支持 IMAGE_WIDTHS 中的尺寸")],
+    fmt: Annotated[Literal["webp", "avif"] | None, Query(description="输出格式，默认按 Accept 协商")] = None,
+    accept: Annotated[str | None, Header()] = None,
+) -> FileResponse:
+    """获取指定宽度和格式的头像，首次请求时从原图缩放并缓存"""
+    if w not in settings.IMAGE_WIDTHS:
+        raise exceptions.INVALID_IMAGE_SIZE
+    formats = supported_formats()
+    headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+    if fmt is None:
+        fmt = "avif" if "avif" in formats and "image/avif" in (accept or "") else "webp"
+        headers["Vary"] = "Accept"
+    elif fmt not in formats:
+        raise exceptions.INVALID_FILE_FORMAT
+
+    source = settings.AVATAR_DIR / str(id) / "og" / filename
+    if not source.exists():
+        raise exceptions.RESOURCE_NOT_FOUND
+    key = f"{filename.removesuffix('.webp')}_w{w}.{fmt}"
+    variant = await get_image_variant(source=source, key=key, width=w, fmt=fmt)
+    if isinstance(variant, bytes):
+        return Response(variant, media_type=f"image/{fmt}", headers=headers)
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, variant)
+    except FileNotFoundError:
+        # 命中缓存后、发送前被其他写入淘汰
+        data = await render_image_variant(source=source, key=key, width=w, fmt=fmt)
+        return Response(data, media_type=f"image/{fmt}", headers=headers)
+    return StaticFileResponse(variant, media_type=f"image/{fmt}", headers=headers, stat_result=stat_result)
@@ -1,3 +1,162 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Path, Query, Request, status
+
+from app import crud
+from app.api.utils import check_post_fields, check_post_permission
+from app.core import exceptions
+from app.core.http_cache import cached_response
+from app.core.pagination import decode_cursor, encode_cursor, split_page
+from app.core.responses import dump_model, model_response
+from app.deps import current_active_user_dep, read_session_dep, session_dep
+from app.schemas import PaginatedResponse, PostCreate, PostResp, PostSearchResp, PostUpdate
 
 router = APIRouter()
+
+
+@router.get("", response_model=PaginatedResponse[PostResp])
+async def read_post_list(
+    request: Request,
+    session: read_session_dep,
+    page: Annotated[int, Query(ge=1, description="页码")] = 1,
+    per_page: Annotated[int, Query(ge=1, le=100, description="每页数量")] = 20,
+    cursor: Annotated[str | None, Query(description="分页游标（上一页的 next_cursor，传入后忽略页码）")] = None,
+    with_total: Annotated[bool, Query(description="是否返回总数")] = True,
+    category_id: Annotated[int | None, Query(ge=1, description="分类 ID")] = None,
+    tag_id: Annotated[int | None, Query(ge=1, description="标签 ID")] = None,
+    author_id: Annotated[int | None, Query(ge=1, description="作者 ID")] = None,
+) -> PaginatedResponse[PostResp]:
+    """获取文章列表（最新的在前）"""
+
+    async def build() -> tuple[bytes, list[str]]:
+        filters = {"category_id": category_id, "tag_id": tag_id, "author_id": author_id}
+        after = decode_cursor(cursor, int, int) if cursor else None
+        skip = 0 if after else (page - 1) * per_page
+        posts = await crud.get_post_list(session=session, skip=skip, limit=per_page + 1, after=after, **filters)
+        posts, next_cursor = split_page(posts, per_page, key=lambda post: (post.created_at, post.id))
+        total = await crud.get_post_count(session=session, **filters) if with_total else None
+        body = dump_model(
+            PaginatedResponse[PostResp],
+            {
+                "data": posts,
+                "meta": {
+                    "total": total,
+                    "page": None if after else page,
+                    "per_page": per_page,
+                    "total_pages": None if after or total is None else (total + per_page - 1) // per_page,
+                    "next_cursor": next_cursor,
+                },
+            },
+        )
+        # 作者信息变更时同样失效
+        tags = ["posts", *{f"user:{post.author_id}" for post in posts}]
+        return body, tags
+
+    return await cached_response(request, build)
+
+
+@router.get("/search", response_model=PaginatedResponse[PostSearchResp])
+async def search_posts(
+    session: read_session_dep,
+    q: Annotated[str, Query(min_length=1, max_length=100, description="搜索关键词，多个词以空格分隔")],
+    per_page: Annotated[int, Query(ge=1, le=100, description="每页数量")] = 20,
+    cursor: Annotated[str | None, Query(description="分页游标（上一页的 next_cursor）")] = None,
+    category_id: Annotated[int | None, Query(ge=1, description="分类 ID")] = None,
+    tag_id: Annotated[int | None, Query(ge=1, description="标签 ID")] = None,
+) -> PaginatedResponse[PostSearchResp]:
+    """全文搜索文章（按相关度排序）"""
+    after = None
+    if cursor:
+        rank_hex, last_id = decode_cursor(cursor, str, int)
+        try:
+            after = (float.fromhex(rank_hex), last_id)
+        except (ValueError, OverflowError):
+            raise exceptions.INVALID_CURSOR
+    if not q.split():
+        raise exceptions.VALIDATION_ERROR
+
+    rows = await crud.search_posts(
+        session=session, q=q, limit=per_page + 1, after=after, category_id=category_id, tag_id=tag_id
+    )
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        _, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor(last_rank.hex(), rows[-1][0].id)  # 十六进制浮点数，游标无精度损失
+
+    return model_response(
+        PaginatedResponse[PostSearchResp],
+        {
+            # 由 model_response 一次校验（ORM 属性与相关度合并为字典，嵌套对象按属性读取）
+            "data": [
+                {**{name: getattr(post, name) for name in PostResp.model_fields}, "rank": rank, "snippet": snippet}
+                for post, rank, snippet in rows
+            ],
+            "meta": {"per_page": per_page, "next_cursor": next_cursor},
+        },
+    )
+
+
+@router.get("/{id}", response_model=PostResp)
+async def read_post(
+    request: Request, session: read_session_dep, id: Annotated[int, Path(ge=1, description="文章 ID")]
+) -> PostResp:
+    """通过文章 ID 获取文章"""
+
+    async def build() -> tuple[bytes, list[str]]:
+        post = await crud.get_post(session=session, id=id)
+        if post is None:
+            raise exceptions.POST_NOT_FOUND
+        return dump_model(PostResp, post), [f"post:{id}", f"user:{post.author_id}"]
+
+    return await cached_response(request, build)
+
+
+@router.post("", response_model=PostResp)
+async def create_post(session: session_dep, current_user: current_active_user_dep, post_create: PostCreate) -> PostResp:
+    """创建文章"""
+    await check_post_fields(
+        session=session, title=post_create.title, category_id=post_create.category_id, tag_ids=post_create.tag_ids
+    )
+    post_created = await crud.create_post(session=session, author_id=current_user.id, post_create=post_create)
+    if post_created is None:
+        raise exceptions.POST_NOT_FOUND
+    return model_response(PostResp, post_created)
+
+
+@router.patch("/{id}", response_model=PostResp)
+async def update_post(
+    session: session_dep,
+    current_user: current_active_user_dep,
+    post_update: PostUpdate,
+    id: Annotated[int, Path(ge=1, description="文章 ID")],
+) -> PostResp:
+    """更新文章"""
+    post = await crud.get_post(session=session, id=id)
+    if post is None:
+        raise exceptions.POST_NOT_FOUND
+    check_post_permission(current_user=current_user, post=post)
+    await check_post_fields(
+        session=session,
+        title=post_update.title if post_update.title != post.title else None,
+        category_id=post_update.category_id,
+        tag_ids=post_update.tag_ids,
+    )
+    post_updated = await crud.update_post(session=session, id=id, post_update=post_update)
+    if post_updated is None:
+        raise exceptions.POST_NOT_FOUND
+    return model_response(PostResp, post_updated)
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_post(
+    session: session_dep,
+    current_user: current_active_user_dep,
+    id: Annotated[int, Path(ge=1, description="文章 ID")],
+) -> None:
+    """删除文章"""
+    post = await crud.get_post(session=session, id=id)
+    if post is None:
+        raise exceptions.POST_NOT_FOUND
+    check_post_permission(current_user=current_user, post=post)
+    await crud.delete_post(session=session, id=id)
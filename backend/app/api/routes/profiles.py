@@ -0,0 +1,47 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Path, status
+from fastapi.responses import FileResponse
+
+from app import settings
+from app.core import exceptions
+from app.core.profiling import list_profiles, profiling
+from app.deps import current_super_admin_dep
+from app.schemas import ProfileStatus, ProfileToggle
+
+router = APIRouter()
+
+
+def _status() -> ProfileStatus:
+    return ProfileStatus(**profiling.status(), profiles=[path.name for path in list_profiles()])
+
+
+@router.get("", response_model=ProfileStatus)
+async def read_profile_status(_current_user: current_super_admin_dep) -> ProfileStatus:
+    """获取分析开关状态和已保存的分析结果"""
+    return _status()
+
+
+@router.put("", response_model=ProfileStatus)
+async def enable_profiling(_current_user: current_super_admin_dep, toggle: ProfileToggle) -> ProfileStatus:
+    """限时开启分析（所有工作进程），到期自动关闭"""
+    profiling.enable(toggle.seconds, toggle.path_prefix)
+    return _status()
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+async def disable_profiling(_current_user: current_super_admin_dep) -> None:
+    """关闭分析"""
+    profiling.disable()
+
+
+@router.get("/{name}", response_class=FileResponse)
+async def download_profile(
+    _current_user: current_super_admin_dep,
+    name: Annotated[str, Path(pattern=r"^[A-Za-z0-9_.-]+\.folded$", description="分析结果文件名")],
+) -> FileResponse:
+    """下载折叠栈文件（可用 flamegraph.pl 或 speedscope 生成火焰图）"""
+    path = settings.PROFILE_DIR / name
+    if not path.is_file():
+        raise exceptions.RESOURCE_NOT_FOUND
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -1,12 +1,14 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Request, Response
+from fastapi import APIRouter, Depends, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud, settings
 from app.core import exceptions
+from app.core.cache import token_cache
+from app.core.revocations import revocations
 from app.core.security import create_access_token, create_refresh_token, verify_token
-from app.deps import session_dep
+from app.deps import optional_token_dep, session_dep
 from app.schemas import AccessToken, TokenData
 
 router = APIRouter()
@@ -43,8 +45,21 @@ async def refresh_access_token(request: Request) -> AccessToken:
     refresh_token = request.cookies.get("refresh_token")
     if refresh_token is None:
         raise exceptions.INVALID_CREDENTIALS
-    token_data: TokenData | None = verify_token(refresh_token)
-    if token_data is None:
+    token_data: TokenData | None = verify_token(refresh_token, typ="refresh")
+    if token_data is None or revocations.is_revoked(token_data.jti):
         raise exceptions.INVALID_CREDENTIALS
     new_access_token = create_access_token(data={"sub": str(token_data.id), "power": token_data.power})
     return AccessToken(access_token=new_access_token, token_type="bearer")
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(session: session_dep, request: Request, response: Response, token: optional_token_dep) -> None:
+    """退出登录：吊销当前的访问令牌和刷新令牌，并删除刷新令牌 Cookie"""
+    revoked = []
+    if token is not None:
+        token_cache.pop(token)
+        revoked.append(verify_token(token))
+    if refresh_token := request.cookies.get("refresh_token"):
+        revoked.append(verify_token(refresh_token, typ="refresh"))
+    await crud.revoke_tokens(session=session, tokens=[token_data for token_data in revoked if token_data is not None])
+    response.delete_cookie(key="refresh_token", httponly=True, secure=True, samesite="Lax")
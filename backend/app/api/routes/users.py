@@ -1,70 +1,117 @@
-import io
+from collections.abc import Awaitable, Callable
 from typing import Annotated
 
-from aiofiles import os as aiofiles_os
-from fastapi import APIRouter, File, Path, Query, UploadFile
-from loguru import logger
+from fastapi import APIRouter, File, Path, Query, Request, Response, UploadFile, status
 from pydantic import EmailStr
 
-from app import crud, settings
-from app.api.utils import avatar_to_webp, check_existing_user
+from app import crud
+from app.api.uploads import UploadLimitRoute, read_image_upload
+from app.api.utils import avatar_tasks, check_existing_user, submit_avatar
 from app.core import exceptions
-from app.deps import current_user_dep, session_dep
-from app.schemas import PaginatedResponse, UserCreate, UserResp, UserUpdate
+from app.core.http_cache import cached_response
+from app.core.pagination import decode_cursor, split_page
+from app.core.responses import dump_model, model_response
+from app.deps import current_user_dep, read_session_dep, session_dep, user_loader_dep
+from app.models import User
+from app.schemas import AvatarTaskResp, PaginatedResponse, UserCreate, UserResp, UserUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=UploadLimitRoute)
 
 
 @router.get("", response_model=PaginatedResponse[UserResp])
 async def read_user_list(
-    session: session_dep,
+    request: Request,
+    session: read_session_dep,
+    loader: user_loader_dep,
     page: Annotated[int, Query(ge=1, description="页码")] = 1,
     per_page: Annotated[int, Query(ge=1, le=100, description="每页数量")] = 20,
+    cursor: Annotated[str | None, Query(description="分页游标（上一页的 next_cursor，传入后忽略页码）")] = None,
+    with_total: Annotated[bool, Query(description="是否返回总数")] = True,
+    ids: Annotated[
+        str | None,
+        Query(pattern=r"^\d+(,\d+){0,99}$", description="按 ID 批量获取（逗号分隔，最多 100 个，传入后忽略分页参数）"),
+    ] = None,
 ) -> PaginatedResponse[UserResp]:
     """获取用户列表"""
-    skip = (page - 1) * per_page
-    users = await crud.get_user_list(session=session, skip=skip, limit=per_page)
-    total = await crud.get_user_count(session=session)
+    if ids is not None:
+        return await _user_batch_response(request, loader, list(dict.fromkeys(int(id) for id in ids.split(","))))
+
+    async def build() -> tuple[bytes, list[str]]:
+        after = decode_cursor(cursor, int, int) if cursor else None
+        skip = 0 if after else (page - 1) * per_page
+        users = await crud.get_user_list(session=session, skip=skip, limit=per_page + 1, after=after)
+        users, next_cursor = split_page(users, per_page, key=lambda user: (user.created_at, user.id))
+        total = await crud.get_user_count(session=session) if with_total else None
+        body = dump_model(
+            PaginatedResponse[UserResp],
+            {
+                "data": users,
+                "meta": {
+                    "total": total,
+                    "page": None if after else page,
+                    "per_page": per_page,
+                    "total_pages": None if after or total is None else (total + per_page - 1) // per_page,
+                    "next_cursor": next_cursor,
+                },
+            },
+        )
+        return body, ["users"]
+
+    return await cached_response(request, build)
+
+
+async def _user_batch_response(request: Request, loader: user_loader_dep, ids: list[int]) -> Response:
+    """按请求顺序返回存在的用户，所有 ID 合并为一次查询"""
+
+    async def build() -> tuple[bytes, list[str]]:
+        users = [user for user in await loader.load_many(ids) if user is not None]
+        body = dump_model(
+            PaginatedResponse[UserResp],
+            {"data": users, "meta": {"total": len(users), "per_page": len(ids)}},
+        )
+        return body, ["users", *(f"user:{id}" for id in ids)]
+
+    return await cached_response(request, build)
+
+
+@router.get("/me", response_model=UserResp)
+async def read_current_user(current_user: current_user_dep) -> UserResp:
+    """获取当前用户信息"""
+    return model_response(UserResp, current_user)
 
-    return {
-        "data": users,
-        "meta": {"total": total, "page": page, "per_page": per_page, "total_pages": (total + per_page - 1) // per_page},
-    }
+
+async def _user_response(request: Request, load: Callable[[], Awaitable[User | None]]) -> Response:
+    async def build() -> tuple[bytes, list[str]]:
+        user = await load()
+        if user is None:
+            raise exceptions.USER_NOT_FOUND
+        return dump_model(UserResp, user), [f"user:{user.id}"]
+
+    return await cached_response(request, build)
 
 
 @router.get("/{id}", response_model=UserResp)
-async def read_user(session: session_dep, id: Annotated[int, Path(ge=1, description="用户 ID")]) -> UserResp:
+async def read_user(
+    request: Request, loader: user_loader_dep, id: Annotated[int, Path(ge=1, description="用户 ID")]
+) -> UserResp:
     """通过用户 ID 获取用户信息"""
-    user = await crud.get_user(session=session, id=id)
-    if user is None:
-        raise exceptions.USER_NOT_FOUND
-    return user
+    return await _user_response(request, lambda: loader.load(id))
 
 
 @router.get("/email/{email}", response_model=UserResp)
 async def read_user_by_email(
-    session: session_dep, email: Annotated[EmailStr, Path(description="用户邮箱")]
+    request: Request, session: read_session_dep, email: Annotated[EmailStr, Path(description="用户邮箱")]
 ) -> UserResp:
     """通过邮箱获取用户信息"""
-    user = await crud.get_user_by_email(session=session, email=email)
-    if user is None:
-        raise exceptions.USER_NOT_FOUND
-    return user
+    return await _user_response(request, lambda: crud.get_user_by_email(session=session, email=email))
 
 
 @router.get("/username/{username}", response_model=UserResp)
-async def read_user_by_username(session: session_dep, username: Annotated[str, Path(description="用户名")]) -> UserResp:
-    """通过邮箱获取用户信息"""
-    user = await crud.get_user_by_username(session=session, username=username)
-    if user is None:
-        raise exceptions.USER_NOT_FOUND
-    return user
-
-
-@router.get("/me", response_model=UserResp)
-async def read_current_user(current_user: current_user_dep) -> UserResp:
-    """获取当前用户信息"""
-    return current_user
+async def read_user_by_username(
+    request: Request, session: read_session_dep, username: Annotated[str, Path(description="用户名")]
+) -> UserResp:
+    """通过用户名获取用户信息"""
+    return await _user_response(request, lambda: crud.get_user_by_username(session=session, username=username))
 
 
 @router.post("/", response_model=UserResp)
@@ -72,7 +119,7 @@ async def create_user(session: session_dep, user_create: UserCreate) -> UserResp
     """创建用户"""
     await check_existing_user(session=session, username=user_create.username, email=user_create.email)
     user_created = await crud.create_user(session=session, user_create=user_create)
-    return user_created
+    return model_response(UserResp, user_created)
 
 
 @router.patch("/{id}", response_model=UserResp)
@@ -95,40 +142,30 @@ async def update_user(
             raise exceptions.PERMISSION_DENIED
 
     user_updated = await crud.update_user(session=session, id=id, user_update=user_update)
-    return user_updated
+    return model_response(UserResp, user_updated)
 
 
-@router.patch("/{id}/avatar", response_model=UserResp)
+@router.patch("/{id}/avatar", response_model=AvatarTaskResp, status_code=status.HTTP_202_ACCEPTED)
 async def update_user_avatar(
-    session: session_dep,
     current_user: current_user_dep,
     id: Annotated[int, Path(ge=1, description="用户 ID")],
     avatar: UploadFile = File(...),
-) -> UserResp:
+) -> AvatarTaskResp:
+    """上传头像（后台处理，立即返回 pending 状态）"""
+    if id != current_user.id:
+        raise exceptions.PERMISSION_DENIED
+    contents = await read_image_upload(avatar)
+    return submit_avatar(id=id, data=contents)
+
+
+@router.get("/{id}/avatar", response_model=AvatarTaskResp)
+async def read_user_avatar_task(
+    current_user: current_user_dep, id: Annotated[int, Path(ge=1, description="用户 ID")]
+) -> AvatarTaskResp:
+    """查询头像处理状态"""
     if id != current_user.id:
         raise exceptions.PERMISSION_DENIED
-    user = await crud.get_user(session=session, id=id)
-    if user is None:
-        raise exceptions.USER_NOT_FOUND
-    if avatar.content_type not in settings.ALLOWED_IMAGE_MIMES:
-        raise exceptions.INVALID_FILE_FORMAT
-    try:
-        # 读取上传文件内容
-        contents = await avatar.read()
-        if len(contents) > settings.MAX_IMAGE_SIZE:
-            raise exceptions.FILE_TOO_LARGE
-        filename = avatar_to_webp(image_data=io.BytesIO(contents), id=id)
-        if user.avatar is not None:
-            old_tb_path = settings.AVATAR_DIR / str(id) / "tb" / filename
-            old_og_path = settings.AVATAR_DIR / str(id) / "og" / filename
-            for path in [old_tb_path, old_og_path]:
-                try:
-                    if await aiofiles_os.path.exists(path):
-                        await aiofiles_os.remove(path)
-                except Exception as e:
-                    logger.error(f"删除用户 id={id} 删除头像错误: {e}")
-        user = await crud.update_user(session=session, id=id, user_update=UserUpdate(avatar=filename))
-        return user
-    except Exception as e:
-        logger.error(f"用户 id={id} 上传头像错误: {e}")
-        raise exceptions.INTERNAL_SERVER_ERROR
+    task = avatar_tasks.get(id)
+    if task is None:
+        return AvatarTaskResp(status="done", avatar=current_user.avatar)
+    return task
@@ -0,0 +1,75 @@
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import Request, Response, UploadFile
+from fastapi.routing import APIRoute
+
+from app import settings
+from app.core import exceptions
+from app.core.images import probe_image_size, sniff_image_mime
+
+
+def limit_request_body(request: Request, max_size: int) -> Request:
+    """限制请求体大小
+
+    先检查 Content-Length，再在接收请求体时累计字节数，超出上限立即中止接收。
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_size:
+        raise exceptions.FILE_TOO_LARGE
+
+    received = 0
+    receive = request.receive
+
+    async def limited_receive():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_size:
+                raise exceptions.FILE_TOO_LARGE
+        return message
+
+    return Request(request.scope, limited_receive)
+
+
+class UploadLimitRoute(APIRoute):
+    """在解析表单之前限制 multipart 请求体大小的路由"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if request.headers.get("content-type", "").startswith("multipart/form-data"):
+                request = limit_request_body(request, settings.MAX_UPLOAD_SIZE)
+            return await original_route_handler(request)
+
+        return route_handler
+
+
+async def read_image_upload(upload: UploadFile, chunk_size: int = 1024 * 64) -> bytes:
+    """分块读取上传的图片
+
+    - 根据文件头的魔数识别格式，不信任客户端提供的 content_type
+    - 超过 MAX_IMAGE_SIZE 时立即中止
+    - 解码像素之前根据文件头中的尺寸拒绝解压炸弹
+    """
+    head = await upload.read(chunk_size)
+    if sniff_image_mime(head) not in settings.ALLOWED_IMAGE_MIMES:
+        raise exceptions.INVALID_FILE_FORMAT
+
+    buffer = bytearray(head)
+    while chunk := await upload.read(chunk_size):
+        buffer += chunk
+        if len(buffer) > settings.MAX_IMAGE_SIZE:
+            raise exceptions.FILE_TOO_LARGE
+    if len(buffer) > settings.MAX_IMAGE_SIZE:
+        raise exceptions.FILE_TOO_LARGE
+
+    size = probe_image_size(bytes(buffer))
+    if size is None:
+        raise exceptions.INVALID_FILE_FORMAT
+    width, height = size
+    if width * height > settings.MAX_IMAGE_PIXELS:
+        raise exceptions.IMAGE_DIMENSIONS_TOO_LARGE
+    return bytes(buffer)
@@ -1,15 +1,54 @@
-import io
-import os
+import asyncio
 import uuid
 
+from aiofiles import os as aiofiles_os
 from loguru import logger
-from PIL import Image
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import settings
 from app.core import exceptions
-from app.crud import get_user_by_email, get_user_by_username
+from app.core.bus import bus
+from app.core.cache import TTLCache
+from app.core.database import unit_of_work
+from app.core.images import image_executor, render_avatar
+from app.crud import (
+    get_category,
+    get_missing_tag_ids,
+    get_post_by_title,
+    get_user,
+    get_user_by_email,
+    get_user_by_username,
+    update_user,
+)
+from app.models import Post
+from app.schemas import AvatarTaskResp, CurrentUser, UserUpdate
+
+# 用户 ID -> 最近一次头像处理任务状态（通过缓存失效总线同步到各工作进程）
+avatar_tasks = TTLCache(maxsize=10000, ttl=60 * 60)
+# 持有后台任务的引用，防止被垃圾回收；关闭时等待其完成
+_background_tasks: set[asyncio.Task] = set()
+
+
+def apply_avatar_task(key: str) -> None:
+    """处理头像任务状态消息 `{用户 ID}|{状态}|{文件名}`，完成状态只更新最近一次上传的任务"""
+    id, status, filename = key.split("|")
+    if status != "pending":
+        task: AvatarTaskResp | None = avatar_tasks.get(int(id))
+        if task is None or task.avatar != filename:
+            return
+    avatar_tasks.set(int(id), AvatarTaskResp(status=status, avatar=filename))
+
+
+bus.subscribe("avatar", apply_avatar_task)
+
+
+async def wait_avatar_tasks(timeout: float) -> None:
+    """等待进行中的头像处理任务完成（应用关闭时调用）"""
+    if _background_tasks:
+        _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+        if pending:
+            logger.warning(f"{len(pending)} 个头像处理任务未在 {timeout} 秒内完成")
 
 
 async def check_existing_user(*, session: AsyncSession, username: str = None, email: EmailStr = None) -> None:
@@ -24,53 +63,67 @@ async def check_existing_user(*, session: AsyncSession, username: str = None, em
             raise exceptions.USER_EMAIL_ALREADY_EXISTS
 
 
-def image_to_webp(
-    *,
-    image_data: io.BytesIO,
-    output_path: str,
-    is_thumbnail: bool = True,
-    max_size: tuple = (200, 200),
-    quality: int = 85,
-) -> str:
-    """将输入的图片数据转换为 WebP 格式并保存到指定目录"""
-    try:
-        with Image.open(image_data) as img:
-            # 转换颜色模式以优化兼容性和质量
-            if img.mode not in ("RGB", "RGBA"):
-                if img.mode in ("LA", "PA", "P") and "A" in img.getbands():
-                    img = img.convert("RGBA")
-                else:
-                    img = img.convert("RGB")
+async def check_post_fields(
+    *, session: AsyncSession, title: str | None = None, category_id: int | None = None, tag_ids: list[int] | None = None
+) -> None:
+    """检查文章标题是否重复，分类和标签是否存在"""
+    if title:
+        existing_post = await get_post_by_title(session=session, title=title)
+        if existing_post:
+            raise exceptions.POST_TITLE_ALREADY_EXISTS
+    if category_id is not None:
+        category = await get_category(session=session, id=category_id)
+        if category is None:
+            raise exceptions.CATEGORY_NOT_FOUND
+    if tag_ids:
+        missing_tag_ids = await get_missing_tag_ids(session=session, tag_ids=tag_ids)
+        if missing_tag_ids:
+            raise exceptions.TAG_NOT_FOUND
+
 
-            # 缩略图，使用 LANCZOS 重采样算法
-            if is_thumbnail:
-                img.thumbnail(max_size, resample=Image.Resampling.LANCZOS)
+def check_post_permission(*, current_user: CurrentUser, post: Post) -> None:
+    """检查是否有权修改文章：作者本人，或权限高于作者的管理员"""
+    if post.author_id != current_user.id and current_user.power <= post.author.power:
+        raise exceptions.PERMISSION_DENIED
 
-            # 保存为 WebP，调整质量和编码方法
-            output_buffer = io.BytesIO()
-            img.save(output_buffer, format="WEBP", quality=quality, method=6)
-            output_buffer.seek(0)
 
-            with open(output_path, "wb") as f:
-                f.write(output_buffer.getvalue())
+async def remove_avatar_files(*, id: int, filename: str) -> None:
+    """删除用户头像的所有尺寸文件"""
+    for size in ["tb", "og"]:
+        path = settings.AVATAR_DIR / str(id) / size / filename
+        try:
+            if await aiofiles_os.path.exists(path):
+                await aiofiles_os.remove(path)
+        except Exception as e:
+            logger.error(f"删除用户 id={id} 旧头像错误: {e}")
 
-            return output_path
 
+async def process_avatar(*, id: int, data: bytes, filename: str) -> None:
+    """处理头像：在图片工作池中生成所有尺寸，然后更新用户头像并删除旧头像"""
+    try:
+        await image_executor.run(render_avatar, data, str(settings.AVATAR_DIR / str(id)), filename)
+        async with unit_of_work() as session:
+            user = await get_user(session=session, id=id)
+            old_avatar = user.avatar if user else None
+            await update_user(session=session, id=id, user_update=UserUpdate(avatar=filename))
+        if old_avatar and old_avatar != filename:
+            await remove_avatar_files(id=id, filename=old_avatar)
+        status = "done"
     except Exception as e:
-        logger.error(f"图片转换错误: {e}")
-        raise exceptions.INVALID_FILE_FORMAT
+        logger.error(f"用户 id={id} 处理头像错误: {e}")
+        await remove_avatar_files(id=id, filename=filename)
+        status = "failed"
+
+    bus.publish("avatar", f"{id}|{status}|{filename}")
 
 
-def avatar_to_webp(*, image_data: io.BytesIO, id: int):
-    output_dir = settings.AVATAR_DIR / str(id)
+def submit_avatar(*, id: int, data: bytes) -> AvatarTaskResp:
+    """提交头像处理任务，立即返回 pending 状态"""
+    if image_executor.saturated:
+        raise exceptions.SERVICE_UNAVAILABLE
     filename = f"{id}_{uuid.uuid4().hex}.webp"
-    tb_dir = output_dir / "tb"
-    og_dir = output_dir / "og"
-    os.makedirs(tb_dir, exist_ok=True)
-    os.makedirs(og_dir, exist_ok=True)
-    tb_path = tb_dir / filename
-    og_path = og_dir / filename
-    tb_path = image_to_webp(image_data=image_data, output_path=tb_path, is_thumbnail=True)
-    og_path = image_to_webp(image_data=image_data, output_path=og_path, is_thumbnail=False)
-
-    return filename
+    bus.publish("avatar", f"{id}|pending|{filename}")
+    background_task = asyncio.create_task(process_avatar(id=id, data=data, filename=filename))
+    _background_tasks.add(background_task)
+    background_task.add_done_callback(_background_tasks.discard)
+    return avatar_tasks.get(id)
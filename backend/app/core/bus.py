@@ -0,0 +1,156 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+from loguru import logger
+
+from app import settings
+
+Handler = Callable[[str], None]
+
+
+class MemoryBackend:
+    """单进程后端：不跨进程广播"""
+
+    def publish(self, channel: str, keys: list[str]) -> None:
+        pass
+
+    async def start(self, dispatch: Callable[[str, str], None]) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """基于 SQLite 通知表的跨进程后端（无需外部服务）
+
+    各工作进程将失效消息写入同一个 SQLite 文件，并按固定间隔轮询其他进程写入的新消息。
+    """
+
+    def __init__(self, *, path: Path, poll_interval: float = 0.05, retention: float = 60):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = uuid.uuid4().hex
+        self._pending: list[tuple[str, str]] = []
+        self._conn: sqlite3.Connection | None = None
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._task: asyncio.Task | None = None
+
+    def publish(self, channel: str, keys: list[str]) -> None:
+        # 启动后才写入，由轮询任务批量提交，不阻塞事件循环
+        if self._task is not None:
+            self._pending.extend((channel, key) for key in keys)
+
+    def _connect(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS invalidations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT, channel TEXT, key TEXT, created_at REAL)"
+        )
+        self._last_id = self._conn.execute("SELECT coalesce(max(id), 0) FROM invalidations").fetchone()[0]
+
+    def _sync(self, pending: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """提交本进程的消息，读取其他进程的新消息（在线程中执行）"""
+        now = time.time()
+        if pending:
+            self._conn.executemany(
+                "INSERT INTO invalidations (origin, channel, key, created_at) VALUES (?, ?, ?, ?)",
+                [(self.origin, channel, key, now) for channel, key in pending],
+            )
+        rows = self._conn.execute(
+            "SELECT id, origin, channel, key FROM invalidations WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        if now - self._last_prune > self.retention:
+            self._conn.execute("DELETE FROM invalidations WHERE created_at < ?", (now - self.retention,))
+            self._last_prune = now
+        return [(channel, key) for _, origin, channel, key in rows if origin != self.origin]
+
+    async def _run(self, dispatch: Callable[[str, str], None]) -> None:
+        while True:
+            pending, self._pending = self._pending, []
+            try:
+                for channel, key in await asyncio.to_thread(self._sync, pending):
+                    dispatch(channel, key)
+            except sqlite3.Error as e:
+                logger.error(f"缓存失效广播错误: {e}")
+                self._pending[:0] = pending
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self, dispatch: Callable[[str, str], None]) -> None:
+        await asyncio.to_thread(self._connect)
+        self._task = asyncio.create_task(self._run(dispatch))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            await asyncio.to_thread(self._sync, self._pending)
+            self._conn.close()
+            self._conn = None
+        self._pending = []
+
+
+class InvalidationBus:
+    """缓存失效总线
+
+    各缓存通过 subscribe 注册失效处理函数；publish 时立即在本进程执行，并通过后端通知其他工作进程，
+    使多进程部署（WORKERS > 1）下各进程的缓存保持一致。
+    """
+
+    def __init__(self, backend: MemoryBackend | SQLiteBackend):
+        self.backend = backend
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._remote_handlers: dict[str, list[Handler]] = defaultdict(list)
+
+    def subscribe(self, channel: str, handler: Handler, *, remote_only: bool = False) -> None:
+        """注册失效处理函数
+
+        - remote_only: 只处理其他进程的消息（本进程已自行更新缓存，如总数缓存的增减）
+        """
+        (self._remote_handlers if remote_only else self._handlers)[channel].append(handler)
+
+    def publish(self, channel: str, *keys: str | int) -> None:
+        keys = [str(key) for key in keys]
+        for key in keys:
+            for handler in self._handlers[channel]:
+                handler(key)
+        self.backend.publish(channel, keys)
+
+    def _dispatch(self, channel: str, key: str) -> None:
+        for handler in self._handlers[channel] + self._remote_handlers[channel]:
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"缓存失效处理错误 channel={channel} key={key}: {e}")
+
+    async def start(self) -> None:
+        await self.backend.start(self._dispatch)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+
+def create_backend() -> MemoryBackend | SQLiteBackend:
+    if settings.CACHE_BUS_BACKEND == "sqlite":
+        return SQLiteBackend(path=settings.CACHE_BUS_PATH, poll_interval=settings.CACHE_BUS_POLL_INTERVAL)
+    return MemoryBackend()
+
+
+bus = InvalidationBus(create_backend())
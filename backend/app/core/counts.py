@@ -0,0 +1,39 @@
+import time
+from collections.abc import Awaitable, Callable
+
+from app import settings
+from app.core.bus import bus
+
+
+class CountCache:
+    """表总数缓存
+
+    在内存中维护各表的总行数，写操作时增减，超过对账间隔后重新从数据库加载。
+    """
+
+    def __init__(self, *, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self._totals: dict[str, tuple[float, int]] = {}
+
+    async def get(self, name: str, loader: Callable[[], Awaitable[int]]) -> int:
+        """获取总数，缓存缺失或过期时调用 loader 从数据库对账"""
+        item = self._totals.get(name)
+        if item is not None and time.monotonic() - item[0] < self.reconcile_seconds:
+            return item[1]
+        total = await loader()
+        self._totals[name] = (time.monotonic(), total)
+        return total
+
+    def incr(self, name: str, delta: int = 1) -> None:
+        """增减总数（未缓存时忽略，下次读取时从数据库加载）"""
+        item = self._totals.get(name)
+        if item is not None:
+            self._totals[name] = (item[0], max(item[1] + delta, 0))
+
+    def invalidate(self, name: str) -> None:
+        self._totals.pop(name, None)
+
+
+count_cache = CountCache(reconcile_seconds=settings.COUNT_RECONCILE_SECONDS)
+# 本进程通过 incr 更新总数，其他进程的写入使本地总数失效
+bus.subscribe("count", count_cache.invalidate, remote_only=True)
@@ -1,19 +1,156 @@
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 import ujson
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from app import settings
+from app.core.metrics import instrument_engine, register_stats
+
+
+def read_database_uri(url: str) -> str | None:
+    """读引擎地址：配置的只读副本，或同一 SQLite 文件的只读（mode=ro）URI；内存数据库等无法共享时返回 None"""
+    if settings.SQLALCHEMY_READ_DATABASE_URI:
+        return settings.SQLALCHEMY_READ_DATABASE_URI
+    sqlite_url = make_url(url)
+    if sqlite_url.get_backend_name() != "sqlite" or sqlite_url.database in (None, "", ":memory:"):
+        return None
+    path = Path(sqlite_url.database).resolve().as_uri()
+    return sqlite_url.set(database=path, query={**sqlite_url.query, "mode": "ro", "uri": "true"}).render_as_string(
+        hide_password=False
+    )
+
+
+def _create_engine(url: str, *, sqlite_pool_size: int) -> AsyncEngine:
+    engine_url = make_url(url)
+    if engine_url.get_backend_name() == "sqlite":
+        pool_options = {"pool_size": sqlite_pool_size, "max_overflow": 0}
+    else:
+        # 服务端数据库支持并发写入，连接池按并发度配置，检出前探测断开的连接
+        pool_options = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_pre_ping": True,
+        }
+        if engine_url.get_driver_name() == "asyncpg":
+            # 每个连接缓存预编译语句，热点查询跳过解析和计划
+            pool_options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return create_async_engine(
+        engine_url,
+        echo=False,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=1800,  # 30 分钟回收连接
+        future=True,  # 启用 2.x 风格
+        json_serializer=ujson.dumps,  # 更快的 ujson 序列化
+        **pool_options,
+    )
 
-async_engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=False,
-    pool_size=15,  # 连接池
-    max_overflow=10,  # 允许的额外连接
-    pool_recycle=1800,  # 30 分钟回收连接
-    future=True,  # 启用 2.x 风格
-    json_serializer=ujson.dumps,  # 更快的 ujson 序列化
+
+_read_uri = read_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+# SQLite 同一时间只允许一个写入者，写引擎只需少量连接，多余的连接只会加剧锁竞争；
+# 读取（列表、搜索）走独立的读引擎，不占用写连接，也不会拿到写锁
+_write_pool_size = settings.SQLITE_WRITE_CONNECTIONS + (0 if _read_uri else settings.SQLITE_READ_CONNECTIONS)
+async_engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI, sqlite_pool_size=_write_pool_size)
+read_engine = (
+    _create_engine(_read_uri, sqlite_pool_size=settings.SQLITE_READ_CONNECTIONS) if _read_uri else async_engine
 )
-async_session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+if async_engine.dialect.name == "sqlite":
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record):
+        """为每个新建的 SQLite 连接设置 PRAGMA（WAL、同步级别、缓存等）"""
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+if read_engine is not async_engine and read_engine.dialect.name == "sqlite":
+
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def set_sqlite_read_pragmas(dbapi_connection, _connection_record):
+        """只读连接：跳过持久化的 journal_mode（由写连接设置），并禁止任何写操作"""
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if name != "journal_mode":
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.execute("PRAGMA query_only=1")
+        cursor.close()
+
+
+def _pool_stats(engine: AsyncEngine) -> Callable[[], dict]:
+    return lambda: {"size": engine.pool.size(), "checked_out": engine.pool.checkedout()}
+
+
+instrument_engine(async_engine.sync_engine)
+register_stats("db_pool", _pool_stats(async_engine))
+if read_engine is not async_engine:
+    instrument_engine(read_engine.sync_engine)
+    register_stats("db_read_pool", _pool_stats(read_engine))
+
+
+# 同一 SQLite 文件的只读连接与写连接共享 WAL，读到的总是最新提交；外部只读副本可能有复制延迟
+READER_MAY_LAG = bool(settings.SQLALCHEMY_READ_DATABASE_URI)
+
+
+class RoutingSession(Session):
+    """按语句路由的会话：读取走读引擎，写入（flush、INSERT/UPDATE/DELETE）走写引擎
+
+    会话一旦写入就固定使用写引擎，保证同一工作单元内读到自己的写入。
+    读引擎是可能延迟的外部副本时，工作单元中写入前的读取（如检查用户名是否重复）也必须读到最新数据，
+    因此整个会话固定使用写引擎。
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if READER_MAY_LAG or self.info.get("writer") or self._flushing or isinstance(clause, UpdateBase):
+            self.info["writer"] = True
+            return async_engine.sync_engine
+        return read_engine.sync_engine
+
+
+async_session = async_sessionmaker(class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False)
+# 只读会话：GET 路由与导出使用，不会占用写连接
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """注册事务提交后执行的回调（缓存失效、广播等），事务回滚时丢弃"""
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def run_after_commit(session: Session):
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_after_commit(session: Session):
+    session.info.pop("after_commit", None)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """工作单元：一个会话贯穿整个请求，CRUD 函数在其中组合，结束时统一提交，出错时回滚
+
+    SQLite 驱动只在第一条写语句前开启事务，读操作不持有写锁，每个请求至多一个写事务。
+    """
+    async with async_session() as session:
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
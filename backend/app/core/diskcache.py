@@ -0,0 +1,118 @@
+import asyncio
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from loguru import logger
+
+from app.core.files import atomic_write
+
+
+class DiskLRUCache:
+    """容量有限的磁盘 LRU 缓存
+
+    - directory: 缓存目录
+    - max_bytes: 缓存总大小上限，超出时淘汰最久未使用的文件（刚写入的文件不会被自身的写入淘汰，
+      单个文件超过上限时暂时保留，直至下一次写入）
+
+    首次使用时按修改时间扫描目录重建索引，因此重启后缓存仍然有效。扫描、写入和删除文件都在线程中执行，
+    不阻塞事件循环；索引只在事件循环线程中修改。
+    """
+
+    def __init__(self, *, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._lock = asyncio.Lock()
+        self.total_bytes = 0
+        # 指标
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _scan(self) -> OrderedDict[str, int]:
+        files = []
+        if self.directory.exists():
+            for path in self.directory.glob("*/*"):
+                if path.is_file() and not path.name.startswith("."):
+                    stat = path.stat()
+                    files.append((stat.st_mtime, path.name, stat.st_size))
+        files.sort()
+        return OrderedDict((name, size) for _, name, size in files)
+
+    async def _load(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            async with self._lock:
+                if self._entries is None:
+                    entries = await asyncio.to_thread(self._scan)
+                    self._entries = entries
+                    self.total_bytes = sum(entries.values())
+                    await self._evict()
+        return self._entries
+
+    async def _evict(self, keep: int = 0) -> None:
+        """淘汰最久未使用的文件，保留最新的 keep 个"""
+        paths = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > keep:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            paths.append(self._path(key))
+        if paths:
+            await asyncio.to_thread(self._unlink, paths)
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"清理图片缓存错误: {e}")
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, data)
+
+    async def get(self, key: str) -> Path | None:
+        """获取缓存文件路径，不存在时返回 None"""
+        entries = await self._load()
+        path = self._path(key)
+        if key in entries:
+            if await asyncio.to_thread(path.exists):
+                entries.move_to_end(key)
+                self.hits += 1
+                return path
+            # 文件已被其他进程淘汰
+            if key in entries:
+                self.total_bytes -= entries.pop(key)
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes) -> Path:
+        """写入缓存文件并返回路径"""
+        entries = await self._load()
+        path = self._path(key)
+        await asyncio.to_thread(self._write, path, data)
+        if key in entries:
+            self.total_bytes -= entries.pop(key)
+        entries[key] = len(data)
+        self.total_bytes += len(data)
+        await self._evict(keep=1)
+        return path
+
+    def stats(self) -> dict[str, int]:
+        """缓存指标"""
+        return {
+            "entries": len(self._entries or ()),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
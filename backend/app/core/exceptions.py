@@ -4,6 +4,9 @@ from fastapi import HTTPException, status
 VALIDATION_ERROR = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="请求参数验证失败")
 INVALID_FILE_FORMAT = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的文件格式")
 FILE_TOO_LARGE = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="文件过大")
+IMAGE_DIMENSIONS_TOO_LARGE = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="图片尺寸过大")
+INVALID_IMAGE_SIZE = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="不支持的图片尺寸")
+INVALID_CURSOR = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
 
 # 401 Unauthorized
 INVALID_CREDENTIALS = HTTPException(
@@ -16,11 +19,15 @@ PERMISSION_DENIED = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=
 # 404 Not Found
 RESOURCE_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="请求的资源不存在")
 USER_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="用户不存在")
+POST_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="文章不存在")
+CATEGORY_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="分类不存在")
+TAG_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="标签不存在")
 
 # 409 Conflict
 DUPLICATE_ENTRY = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="数据已存在，不允许重复创建")
 USER_NAME_ALREADY_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="用户名已存在")
 USER_EMAIL_ALREADY_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="用户邮箱已存在")
+POST_TITLE_ALREADY_EXISTS = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="文章标题已存在")
 
 # 422 Unprocessable Entity
 UNPROCESSABLE_ENTITY = HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="请求数据格式不正确")
@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
+
+from app.core import exceptions
+
+
+class BoundedExecutor:
+    """有界工作池
+
+    将 CPU 密集型的同步函数放到线程池/进程池中执行，避免阻塞事件循环。
+
+    - kind: 工作池类型，`thread` 或 `process`
+    - workers: 工作线程/进程数量，同时也是并发执行上限
+    - max_queue: 排队等待的任务上限，超出时直接拒绝（503）
+    """
+
+    def __init__(
+        self, *, name: str, kind: Literal["thread", "process"] = "thread", workers: int = 2, max_queue: int = 64
+    ):
+        self.name = name
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # 指标
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0  # 成功完成的任务
+        self.failed = 0  # 抛出异常的任务
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], /, *args: Any) -> Any:
+        """在工作池中执行 `func(*args)` 并等待结果"""
+        if self.saturated:
+            self.rejected += 1
+            raise exceptions.SERVICE_UNAVAILABLE
+
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.running -= 1
+            semaphore.release()
+
+    @property
+    def saturated(self) -> bool:
+        """排队任务是否已达上限"""
+        return self.waiting >= self.max_queue
+
+    def stats(self) -> dict[str, int]:
+        """工作池指标"""
+        return {
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作池（再次提交任务时会重新创建）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        self._semaphore = None
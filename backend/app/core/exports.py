@@ -0,0 +1,85 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Literal
+
+import ujson
+from sqlalchemy import Select
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app import settings
+from app.core import exceptions
+from app.core.database import read_session
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class ExportLimiter:
+    """限制同时进行的导出数
+
+    导出在整个下载期间占用一个读连接，慢速客户端会长时间持有连接；不限制时几个并发导出即可耗尽读连接池，
+    让所有读请求排队至 `DB_POOL_TIMEOUT`。名额满时直接拒绝（503），而不是排队等待。
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def acquire(self) -> None:
+        """占用一个导出名额，已满时抛出 503"""
+        if self.active >= self.limit:
+            self.rejected += 1
+            raise exceptions.SERVICE_UNAVAILABLE
+        self.active += 1
+
+    def release(self) -> None:
+        """归还导出名额"""
+        self.active -= 1
+        self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        """导出指标"""
+        return {"limit": self.limit, "active": self.active, "completed": self.completed, "rejected": self.rejected}
+
+
+export_limiter = ExportLimiter(settings.EXPORT_MAX_CONCURRENT)
+
+
+class ExportResponse(StreamingResponse):
+    """占用导出名额的流式响应，响应结束（包括客户端断开）时归还名额
+
+    名额在响应中而不是生成器中归还：客户端在开始迭代前断开时，生成器的 `finally` 不会执行。
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            export_limiter.release()
+
+
+async def stream_export(stmt: Select, fmt: ExportFormat, chunk_rows: int = 1000) -> AsyncIterator[bytes]:
+    """通过服务端游标逐批读取查询结果，编码为 NDJSON / CSV 分块输出，内存占用与表大小无关
+
+    会话在生成器内部创建：StreamingResponse 在路由函数（及其依赖）返回后才开始迭代。
+    """
+    async with read_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=chunk_rows))
+        columns = list(result.keys())
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            async for rows in result.partitions():
+                yield "".join(ujson.dumps(dict(zip(columns, row, strict=True))) + "\n" for row in rows).encode()
@@ -0,0 +1,115 @@
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+
+from app import settings
+from app.core.bus import bus
+from app.core.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    tags: tuple[str, ...]
+
+
+class ResponseCache:
+    """公开读接口的响应缓存
+
+    以请求路径（含查询参数）为键，缓存序列化后的响应体和 ETag；写操作按标签（如 `user:1`）使缓存失效。
+
+    每次失效递增代数并记录各标签最近失效时的代数。生成响应前记下当前代数，写入缓存时如果响应的
+    任一标签在此之后失效过，说明响应可能基于失效前的数据，只返回不缓存。
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tags: dict[str, set[str]] = {}
+        self.generation = 0
+        self._invalidated: dict[str, int] = {}  # 标签 -> 最近失效时的代数
+        self._floor = 0  # 早于此代数的失效记录已清理，生成于此前的响应一律视为过期
+
+    def get(self, key: str) -> CachedResponse | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, body: bytes, tags: list[str], *, since: int | None = None) -> CachedResponse:
+        """缓存响应；since 为生成响应前的代数，期间有相关标签失效时不缓存"""
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = CachedResponse(body=body, etag=etag, tags=tuple(tags))
+        if since is not None and self._stale(entry.tags, since):
+            return entry
+        self._cache.set(key, entry)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        if len(self._tags) > self._cache.maxsize * 2:
+            self._prune_tags()
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """使带有任一标签的缓存失效"""
+        self.generation += 1
+        for tag in tags:
+            self._invalidated[tag] = self.generation
+            for key in self._tags.pop(tag, ()):
+                self._cache.pop(key)
+        if len(self._invalidated) > self._cache.maxsize * 2:
+            self._invalidated.clear()
+            self._floor = self.generation
+
+    def _stale(self, tags: tuple[str, ...], since: int) -> bool:
+        return since < self._floor or any(self._invalidated.get(tag, 0) > since for tag in tags)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._tags.clear()
+        self.generation += 1
+        self._invalidated.clear()
+        self._floor = self.generation
+
+    def _prune_tags(self) -> None:
+        """清理已被淘汰的缓存条目留下的标签索引"""
+        for tag, keys in list(self._tags.items()):
+            keys.intersection_update(key for key in keys if self._cache.peek(key) is not None)
+            if not keys:
+                del self._tags[tag]
+
+    def stats(self) -> dict[str, int]:
+        """缓存指标"""
+        return {**self._cache.stats(), "tags": len(self._tags)}
+
+
+response_cache = ResponseCache(maxsize=settings.RESPONSE_CACHE_MAXSIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+bus.subscribe("tag", response_cache.invalidate)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        value.strip().removeprefix("W/") for value in if_none_match.split(",")
+    )
+
+
+async def cached_response(
+    request: Request, build: Callable[[], Awaitable[tuple[bytes, list[str]]]], media_type: str = "application/json"
+) -> Response:
+    """返回带 ETag 的缓存响应
+
+    - build: 缓存未命中时调用，返回 (JSON 响应体, 失效标签)
+    - 缓存命中且 If-None-Match 匹配时直接返回 304，不访问数据库
+    """
+    key = request.url.path if not request.url.query else f"{request.url.path}?{request.url.query}"
+    entry = response_cache.get(key)
+    if entry is None:
+        since = response_cache.generation
+        body, tags = await build()
+        entry = response_cache.set(key, body, tags, since=since)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
@@ -0,0 +1,140 @@
+import asyncio
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from app import settings
+from app.core import exceptions
+from app.core.diskcache import DiskLRUCache
+from app.core.executors import BoundedExecutor
+from app.core.files import atomic_write
+
+try:
+    import pillow_avif  # noqa: F401 可选的 AVIF 编码插件
+except ImportError:
+    pass
+
+image_executor = BoundedExecutor(
+    name="image",
+    kind=settings.IMAGE_EXECUTOR,
+    workers=settings.IMAGE_WORKERS,
+    max_queue=settings.IMAGE_MAX_QUEUE,
+)
+image_cache = DiskLRUCache(directory=settings.IMAGE_CACHE_DIR, max_bytes=settings.IMAGE_CACHE_MAX_BYTES)
+# 正在生成的图片，相同请求共享同一任务
+_rendering: dict[str, asyncio.Task] = {}
+# 工作进程中同样生效，超出时 Pillow 拒绝解码
+Image.MAX_IMAGE_PIXELS = settings.MAX_IMAGE_PIXELS
+
+# 文件头魔数
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+
+
+def sniff_image_mime(head: bytes) -> str | None:
+    """根据文件头的魔数识别图片格式"""
+    for signature, mime in IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def probe_image_size(data: bytes) -> tuple[int, int] | None:
+    """只解析文件头获取图片尺寸，不解码像素"""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            return img.size
+    except Image.DecompressionBombError:
+        raise exceptions.IMAGE_DIMENSIONS_TOO_LARGE
+    except (OSError, SyntaxError):
+        return None
+
+
+def supported_formats() -> set[str]:
+    """可用的输出格式（AVIF 取决于 Pillow 是否支持）"""
+    Image.init()
+    return {fmt for fmt in settings.IMAGE_FORMATS if fmt.upper() in Image.SAVE}
+
+
+def encode_image(img: Image.Image, fmt: str = "webp", quality: int = 85) -> bytes:
+    """编码为 WebP 或 AVIF"""
+    output_buffer = io.BytesIO()
+    if fmt == "avif":
+        img.save(output_buffer, format="AVIF", quality=quality)
+    else:
+        img.save(output_buffer, format="WEBP", quality=quality, method=6)
+    return output_buffer.getvalue()
+
+
+def render_avatar(data: bytes, output_dir: str, filename: str) -> str:
+    """生成头像的所有尺寸（在图片工作池中执行）
+
+    只解码一次原图，分别生成原图（og）和缩略图（tb）的 WebP 文件。
+    """
+    output_dir = Path(output_dir)
+    tb_dir = output_dir / "tb"
+    og_dir = output_dir / "og"
+    tb_dir.mkdir(parents=True, exist_ok=True)
+    og_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(io.BytesIO(data)) as img:
+        # 转换颜色模式以优化兼容性和质量
+        if img.mode not in ("RGB", "RGBA"):
+            if img.mode in ("LA", "PA", "P") and "A" in img.getbands():
+                img = img.convert("RGBA")
+            else:
+                img = img.convert("RGB")
+
+        og_data = encode_image(img)
+        # 缩略图，使用 LANCZOS 重采样算法
+        thumbnail = img.copy()
+        thumbnail.thumbnail(settings.AVATAR_THUMBNAIL_SIZE, resample=Image.Resampling.LANCZOS)
+        tb_data = encode_image(thumbnail)
+
+    atomic_write(og_dir / filename, og_data)
+    atomic_write(tb_dir / filename, tb_data)
+    return filename
+
+
+def render_variant(source: str, width: int, fmt: str) -> bytes:
+    """按宽度等比缩放原图并编码（在图片工作池中执行），不放大"""
+    with Image.open(source) as img:
+        if img.width > width:
+            height = max(round(img.height * width / img.width), 1)
+            img = img.resize((width, height), resample=Image.Resampling.LANCZOS)
+        return encode_image(img, fmt)
+
+
+async def render_image_variant(*, source: Path, key: str, width: int, fmt: str) -> bytes:
+    """生成指定宽度和格式的图片并写入磁盘缓存，返回生成的数据；相同请求共享同一任务"""
+    task = _rendering.get(key)
+    if task is None:
+
+        async def render() -> bytes:
+            try:
+                data = await image_executor.run(render_variant, str(source), width, fmt)
+                await image_cache.put(key, data)
+                return data
+            finally:
+                _rendering.pop(key, None)
+
+        task = _rendering[key] = asyncio.create_task(render())
+    return await asyncio.shield(task)
+
+
+async def get_image_variant(*, source: Path, key: str, width: int, fmt: str) -> Path | bytes:
+    """获取指定宽度和格式的图片：命中磁盘缓存时返回文件路径，否则生成并返回数据
+
+    生成后直接返回数据而不是缓存文件的路径：文件在发送前可能已被并发的写入淘汰。
+    """
+    path = await image_cache.get(key)
+    if path is not None:
+        return path
+    return await render_image_variant(source=source, key=key, width=width, fmt=fmt)
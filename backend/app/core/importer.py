@@ -0,0 +1,208 @@
+import asyncio
+import csv
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Literal
+
+import ujson
+from loguru import logger
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bus import bus
+from app.core.counts import count_cache
+from app.core.database import async_session
+from app.core.executors import BoundedExecutor
+from app.core.security import get_password_hash
+from app.models import Category, ImportCheckpoint, Post, Tag, User, posts_tags
+
+Format = Literal["jsonl", "csv"]
+
+
+@dataclass
+class ImportStats:
+    source: str
+    rows: int  # 本次导入的记录数
+    skipped: int  # 续传时跳过的已导入记录数
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_records(path: Path, fmt: Format | None = None) -> Iterator[dict[str, Any]]:
+    """逐条读取 JSONL / CSV 记录（按扩展名判断格式），不将整个文件载入内存"""
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with path.open(newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield ujson.loads(line)
+
+
+def _batched(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _split_names(value: str | list[str] | None) -> list[str]:
+    """标签字段：JSONL 中为列表，CSV 中以 `|` 分隔"""
+    if not value:
+        return []
+    names = value if isinstance(value, list) else value.split("|")
+    return [name.strip() for name in names if name.strip()]
+
+
+def _timestamps(record: dict) -> dict[str, int]:
+    """保留原始时间戳（批量插入要求每行的字段一致，缺失时使用当前时间）"""
+    created_at = int(record.get("created_at") or time.time())
+    return {"created_at": created_at, "updated_at": int(record.get("updated_at") or created_at)}
+
+
+async def _load_checkpoint(source: str, restart: bool) -> int:
+    async with async_session() as session:
+        async with session.begin():
+            checkpoint = await session.get(ImportCheckpoint, source)
+            if checkpoint is None:
+                return 0
+            if restart:
+                await session.delete(checkpoint)
+                return 0
+            return checkpoint.position
+
+
+async def _save_checkpoint(session: AsyncSession, source: str, position: int) -> None:
+    await session.merge(ImportCheckpoint(source=source, position=position))
+
+
+async def _ensure_names(session: AsyncSession, model: type[Category | Tag], names: set[str], ids: dict[str, int]):
+    """批量创建缺失的分类/标签，并写入查找表"""
+    if missing := names - ids.keys():
+        await session.execute(insert(model), [{"name": name} for name in missing])
+        result = await session.execute(select(model.name, model.id).where(model.name.in_(missing)))
+        ids.update(result.all())
+
+
+async def _run_import(source: str, path: Path, *, fmt: Format | None, batch_size: int, restart: bool, write_batch):
+    """按批读取记录并写入，每批与导入进度在同一事务中提交，失败后从最后提交的批次继续"""
+    position = skipped = await _load_checkpoint(source, restart)
+    if skipped:
+        logger.info(f"从第 {skipped} 条记录继续导入 {source}")
+    start = time.perf_counter()
+    for batch in _batched(islice(read_records(path, fmt), skipped, None), batch_size):
+        try:
+            async with async_session() as session:
+                async with session.begin():
+                    await write_batch(session, batch)
+                    await _save_checkpoint(session, source, position + len(batch))
+        except Exception as e:
+            logger.error(f"导入失败 {source} 第 {position + 1}-{position + len(batch)} 条记录: {e}")
+            raise
+        position += len(batch)
+        elapsed = time.perf_counter() - start
+        logger.info(f"已导入 {position} 条记录, {(position - skipped) / elapsed:.0f} 行/秒")
+    return ImportStats(source=source, rows=position - skipped, skipped=skipped, seconds=time.perf_counter() - start)
+
+
+async def import_users(
+    path: Path, *, fmt: Format | None = None, batch_size: int = 1000, restart: bool = False
+) -> ImportStats:
+    """批量导入用户
+
+    记录字段: username, email, password（或已哈希的 hashed_password）, power, created_at, updated_at
+    """
+    # bcrypt 计算时释放 GIL，使用与 CPU 核数相同的线程并行哈希
+    hasher = BoundedExecutor(name="import_hash", workers=os.cpu_count() or 2, max_queue=batch_size)
+
+    async def user_row(record: dict) -> dict:
+        hashed_password = record.get("hashed_password") or await hasher.run(get_password_hash, record["password"])
+        power = record.get("power")
+        return {
+            "username": record["username"],
+            "email": record["email"],
+            "hashed_password": hashed_password,
+            # 0 表示封禁用户，只有缺省时才使用默认值
+            "power": 1 if power in (None, "") else int(power),
+            **_timestamps(record),
+        }
+
+    async def write_batch(session: AsyncSession, batch: list[dict]) -> None:
+        rows = await asyncio.gather(*(user_row(record) for record in batch))
+        await session.execute(insert(User), rows)
+
+    try:
+        stats = await _run_import(
+            f"users:{path.resolve()}", path, fmt=fmt, batch_size=batch_size, restart=restart, write_batch=write_batch
+        )
+    finally:
+        hasher.shutdown()
+        count_cache.invalidate("users")
+        bus.publish("count", "users")
+        bus.publish("tag", "users")
+    return stats
+
+
+async def import_posts(
+    path: Path, *, fmt: Format | None = None, batch_size: int = 1000, restart: bool = False
+) -> ImportStats:
+    """批量导入文章
+
+    记录字段: title, content, author（用户名）或 author_id, category（分类名）, tags（标签名列表）,
+    created_at, updated_at；不存在的分类和标签自动创建。两者都有时以 author 为准：导出文件中的 author_id
+    是源数据库的用户 ID，导入到其他数据库时不一定对应同一用户
+    """
+    async with async_session() as session:
+        async with session.begin():
+            category_ids = dict((await session.execute(select(Category.name, Category.id))).all())
+            tag_ids = dict((await session.execute(select(Tag.name, Tag.id))).all())
+    author_ids: dict[str, int] = {}
+
+    async def write_batch(session: AsyncSession, batch: list[dict]) -> None:
+        if usernames := {record["author"] for record in batch if record.get("author")} - author_ids.keys():
+            result = await session.execute(select(User.username, User.id).where(User.username.in_(usernames)))
+            author_ids.update(result.all())
+            if missing := usernames - author_ids.keys():
+                raise ValueError(f"作者不存在: {', '.join(sorted(missing))}")
+        await _ensure_names(
+            session, Category, {record["category"] for record in batch if record.get("category")}, category_ids
+        )
+        await _ensure_names(
+            session, Tag, {name for record in batch for name in _split_names(record.get("tags"))}, tag_ids
+        )
+
+        rows = [
+            {
+                "title": record["title"],
+                "content": record["content"],
+                "author_id": author_ids[record["author"]] if record.get("author") else int(record["author_id"]),
+                "category_id": category_ids.get(record.get("category")),
+                **_timestamps(record),
+            }
+            for record in batch
+        ]
+        result = await session.execute(insert(Post).returning(Post.id, sort_by_parameter_order=True), rows)
+        links = [
+            {"post_id": post_id, "tag_id": tag_ids[name]}
+            for post_id, record in zip(result.scalars(), batch, strict=True)
+            for name in set(_split_names(record.get("tags")))
+        ]
+        if links:
+            await session.execute(insert(posts_tags), links)
+
+    try:
+        stats = await _run_import(
+            f"posts:{path.resolve()}", path, fmt=fmt, batch_size=batch_size, restart=restart, write_batch=write_batch
+        )
+    finally:
+        count_cache.invalidate("posts")
+        bus.publish("count", "posts")
+        bus.publish("tag", "posts")
+    return stats
@@ -1,3 +1,4 @@
+import asyncio
 import shutil
 from contextlib import asynccontextmanager
 
@@ -6,13 +7,25 @@ from loguru import logger
 from sqlalchemy import inspect
 
 from app import settings
+from app.api.utils import wait_avatar_tasks
+from app.core.bus import bus
 from app.core.database import async_engine, async_session
+from app.core.images import image_executor
+from app.core.revocations import revocations
+from app.core.security import password_hasher
+from app.core.static import precompress_static_dir
 
 
 def folder_init():
     """文件夹初始化"""
     try:
-        for path in [settings.DATA_DIR, settings.POST_IMAGES_DIR, settings.AVATAR_DIR]:
+        for path in [
+            settings.DATA_DIR,
+            settings.POST_IMAGES_DIR,
+            settings.AVATAR_DIR,
+            settings.IMAGE_CACHE_DIR,
+            settings.PROFILE_DIR,
+        ]:
             path.mkdir(parents=True, exist_ok=True)
             logger.info(f"目录就绪: {path}")
 
@@ -28,7 +41,7 @@ def folder_drop():
     """文件夹清理"""
     try:
         # for path in [settings.DATA_DIR, settings.POST_IMAGES_DIR, settings.AVATAR_DIR]: # 数据库文件被其他进程占用错误
-        for path in [settings.POST_IMAGES_DIR, settings.AVATAR_DIR]:
+        for path in [settings.POST_IMAGES_DIR, settings.AVATAR_DIR, settings.IMAGE_CACHE_DIR, settings.PROFILE_DIR]:
             if path.exists():
                 shutil.rmtree(path)
                 logger.info(f"目录已清理: {path}")
@@ -39,11 +52,11 @@ def folder_drop():
 
 
 async def db_init(force_drop: bool = False):
-    """数据库初始化
+    """数据库初始化：执行未执行的迁移（新数据库直接按模型建表）
 
     - force_drop: 是否强制删除重建（用于开发环境）
     """
-    from app import models  # noqa
+    from app.core.migrations import run_migrations
     from app.models.base import ModelBase
 
     try:
@@ -52,8 +65,10 @@ async def db_init(force_drop: bool = False):
                 await conn.run_sync(ModelBase.metadata.drop_all)
                 logger.info("已强制删除旧表")
 
-            await conn.run_sync(ModelBase.metadata.create_all)
-            logger.info(f"数据库初始化{'并重建' if force_drop else '完成'}")
+            versions = await conn.run_sync(run_migrations)
+            logger.info(
+                f"数据库初始化{'并重建' if force_drop else '完成'}" + (f"，已迁移至 {versions[-1]}" if versions else "")
+            )
     except Exception as e:
         logger.error(f"数据库初始化失败: {e}")
         raise
@@ -75,16 +90,17 @@ async def db_drop():
 
 async def create_super_admin():
     """创建超级管理员"""
-    from app.core.security import get_password_hash
+    from app.core.security import async_get_password_hash
     from app.models.users import User
 
     try:
+        hashed_password = await async_get_password_hash(settings.SUPERADMIN_PASSWORD)
         async with async_session() as session:
             async with session.begin():
                 superadmin = User(
                     username=settings.SUPERADMIN_NAME,
                     email=settings.SUPERADMIN_EMAIL,
-                    hashed_password=get_password_hash(settings.SUPERADMIN_PASSWORD),
+                    hashed_password=hashed_password,
                     power=2,
                 )
                 session.add(superadmin)
@@ -103,23 +119,25 @@ async def check_tables_exist() -> bool:
 
 async def create_test_user():
     """创建测试用户"""
-    from app.core.security import get_password_hash
+    from app.core.security import async_get_password_hash
     from app.models.users import User
 
     try:
+        # 并行生成 6 个测试用户的密码哈希
+        hashed_passwords = await asyncio.gather(*(async_get_password_hash("123456") for _ in range(6)))
         async with async_session() as session:
             async with session.begin():
                 test_super_admin = User(
                     username="test_super_admin",
                     email="test_super_admin@seek2.team",
-                    hashed_password=get_password_hash("123456"),
+                    hashed_password=hashed_passwords[0],
                     power=3,
                 )
                 session.add(test_super_admin)
                 test_admin = User(
                     username="test_admin",
                     email="test_admin@seek2.team",
-                    hashed_password=get_password_hash("123456"),
+                    hashed_password=hashed_passwords[1],
                     power=2,
                 )
                 session.add(test_admin)
@@ -130,7 +148,7 @@ async def create_test_user():
                     test_user = User(
                         username=username,
                         email=f"{username}@seek2.team",
-                        hashed_password=get_password_hash("123456"),
+                        hashed_password=hashed_passwords[2 + i],
                     )
                     session.add(test_user)
                     test_users.append(test_user)
@@ -141,6 +159,45 @@ async def create_test_user():
         raise
 
 
+async def create_seed_data(*, users: int, posts: int, password: str = "123456") -> list[str]:
+    """批量生成用户和文章（用于基准测试），返回生成的用户名
+
+    所有用户共用一个密码哈希，文章按顺序轮流分配给各用户。
+    """
+    from sqlalchemy import insert, select
+
+    from app.core.security import async_get_password_hash
+    from app.models import Post, User
+
+    hashed_password = await async_get_password_hash(password)
+    usernames = [f"bench_user_{i}" for i in range(users)]
+    async with async_session() as session:
+        async with session.begin():
+            await session.execute(
+                insert(User),
+                [
+                    {"username": username, "email": f"{username}@seek2.team", "hashed_password": hashed_password}
+                    for username in usernames
+                ],
+            )
+            result = await session.execute(select(User.id).where(User.username.in_(usernames)))
+            author_ids = list(result.scalars())
+            if posts and author_ids:
+                await session.execute(
+                    insert(Post),
+                    [
+                        {
+                            "title": f"bench_post_{i}",
+                            "content": f"benchmark post {i} " * 20,
+                            "author_id": author_ids[i % len(author_ids)],
+                        }
+                        for i in range(posts)
+                    ],
+                )
+    logger.info(f"测试数据创建成功: {users} 个用户, {posts} 篇文章")
+    return usernames
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
@@ -152,19 +209,25 @@ async def lifespan(app: FastAPI):
         f"端口: {settings.PORT}"
     )
     folder_init()
-    if settings.APP_ENV == "production":
-        tables_exist = await check_tables_exist()
-        await db_init(force_drop=False)
-        if not tables_exist:
-            await create_super_admin()
-    else:
-        await db_init(force_drop=True)
+    tables_exist = not settings.DB_RESET_ON_START and await check_tables_exist()
+    await db_init(force_drop=settings.DB_RESET_ON_START)
+    if not tables_exist:
         await create_super_admin()
-        await create_test_user()
+        if settings.APP_ENV == "development":
+            await create_test_user()
+    await asyncio.to_thread(precompress_static_dir, settings.STATIC_DIR)
+    await bus.start()
+    await revocations.start()
 
     yield
 
-    if settings.APP_ENV == "development":
+    await wait_avatar_tasks(timeout=30)
+    await revocations.stop()
+    await bus.stop()
+    password_hasher.shutdown()
+    image_executor.shutdown()
+
+    if settings.DB_RESET_ON_START:
         await db_drop()
         folder_drop()
 
@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):  # noqa: UP046 保持 Python 3.11 可导入
+    """请求内批量加载器
+
+    同一事件循环轮次内的 `load` 调用合并为一次 `batch_load(keys)`（如一条 `WHERE id IN (...)` 查询），
+    同一个键在加载器生命周期内只查询一次。
+
+    - batch_load: 接收去重后的键列表，返回 {键: 值}，缺失的键对应 None
+    - max_batch_size: 单次批量查询的最大键数量，超出时分多次顺序查询
+
+    批量查询共用调用方的会话（AsyncSession 不能并发使用），不同轮次的查询也依次执行。
+    """
+
+    def __init__(self, batch_load: Callable[[list[K]], Awaitable[dict[K, V]]], *, max_batch_size: int = 500):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    def load(self, key: K) -> Awaitable[V | None]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def clear(self, key: K) -> None:
+        """写操作后清除已加载的值"""
+        self._futures.pop(key, None)
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        futures = {key: self._futures[key] for key in keys if key in self._futures}
+        task = asyncio.create_task(self._run(futures))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, futures: dict[K, asyncio.Future[V | None]]) -> None:
+        keys = list(futures)
+        try:
+            # 各轮次的批量查询共用同一会话，必须依次执行
+            async with self._lock:
+                for i in range(0, len(keys), self.max_batch_size):
+                    batch = keys[i : i + self.max_batch_size]
+                    try:
+                        values = await self.batch_load(batch)
+                    except Exception as e:
+                        for key in batch:
+                            # 失败的键不缓存，下次 load 时重新查询
+                            self._discard(key, futures[key])
+                            if not futures[key].done():
+                                futures[key].set_exception(e)
+                        continue
+                    for key in batch:
+                        if not futures[key].done():
+                            futures[key].set_result(values.get(key))
+        finally:
+            # 被取消时（如请求中断）未完成的键同样不缓存，等待者收到 CancelledError 而不是一直挂起
+            for key, future in futures.items():
+                if not future.done():
+                    self._discard(key, future)
+                    future.cancel()
+
+    def _discard(self, key: K, future: asyncio.Future[V | None]) -> None:
+        if self._futures.get(key) is future:
+            del self._futures[key]
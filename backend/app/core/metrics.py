@@ -0,0 +1,248 @@
+import bisect
+import os
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+M = TypeVar("M", "Counter", "Gauge", "Histogram")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        self._values[labels] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """当前值指标；传入 collect 时在输出时调用，返回 {标签值: 数值}"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+        self._values: dict[tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        self._values[labels] += value
+
+    def dec(self, *labels: str, value: float = 1) -> None:
+        self._values[labels] -= value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        values = self.collect() if self.collect is not None else self._values
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # 标签值 -> (各桶计数（非累计，最后一个为 +Inf）, 总和)
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        item = self._values.get(labels)
+        if item is None:
+            item = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = item
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = (*self.labels, "le")
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_format_labels(names, (*labels, le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {total[0]:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[Counter | Gauge | Histogram] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 文本格式"""
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter("http_requests_total", "HTTP 请求数", ("method", "route", "status")))
+http_in_flight = registry.register(Gauge("http_requests_in_flight", "正在处理的 HTTP 请求数"))
+http_duration = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP 请求耗时（秒）", ("method", "route"))
+)
+http_response_size = registry.register(
+    Histogram("http_response_size_bytes", "HTTP 响应体大小（字节）", ("method", "route"), buckets=SIZE_BUCKETS)
+)
+db_queries_per_request = registry.register(
+    Histogram("db_queries_per_request", "每个请求执行的 SQL 数量", ("method", "route"), buckets=QUERY_COUNT_BUCKETS)
+)
+# 多进程部署时每个工作进程分别统计，以 pid 区分
+process_info = registry.register(
+    Gauge("app_process_info", "输出指标的工作进程", ("pid",), collect=lambda: {(str(os.getpid()),): 1})
+)
+db_query_duration = registry.register(Histogram("db_query_duration_seconds", "SQL 执行耗时（秒）"))
+db_time_per_request = registry.register(
+    Histogram("db_time_per_request_seconds", "每个请求的 SQL 总耗时（秒）", ("method", "route"))
+)
+
+# 组件名 -> stats() 函数（工作池、缓存等已有的指标）
+_component_stats: dict[str, Callable[[], dict[str, int]]] = {}
+
+
+def register_stats(component: str, stats: Callable[[], dict[str, int]]) -> None:
+    """注册组件指标，在输出时调用 `stats()` 并以 `app_component_stat` 输出"""
+    _component_stats[component] = stats
+
+
+def _collect_component_stats() -> dict[tuple[str, ...], float]:
+    return {
+        (component, name): value for component, stats in _component_stats.items() for name, value in stats().items()
+    }
+
+
+registry.register(
+    Gauge("app_component_stat", "工作池与缓存指标", ("component", "stat"), collect=_collect_component_stats)
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+# 当前请求的 SQL 统计（请求外执行的 SQL 只计入总耗时）
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """统计 SQL 数量与耗时（异步引擎传入 `async_engine.sync_engine`）"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        db_query_duration.observe(elapsed)
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+
+def _route_label(scope: Scope, root_path: str) -> str:
+    """使用路由模板（如 `/api/users/{id}`）而不是实际路径，避免标签数量无限增长"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # 挂载的子应用（如 /static）
+    mount_path = scope.get("root_path", "")[len(root_path) :]
+    return mount_path or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """记录每个请求的耗时、状态码、响应大小和 SQL 数量"""
+
+    def __init__(self, app: ASGIApp, *, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        status_code = 500
+        size = 0
+        sized = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size, sized
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_length = Headers(raw=message["headers"]).get("content-length")
+                if content_length is not None:
+                    size, sized = int(content_length), True
+            elif message["type"] == "http.response.body" and not sized:
+                # 流式响应没有 Content-Length，累加各个分块
+                size += len(message.get("body", b""))
+            await send(message)
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            _query_stats.reset(token)
+            method, route = scope["method"], _route_label(scope, root_path)
+            http_requests.inc(method, route, str(status_code))
+            http_duration.observe(elapsed, method, route)
+            http_response_size.observe(size, method, route)
+            db_queries_per_request.observe(stats.count, method, route)
+            db_time_per_request.observe(stats.duration, method, route)
@@ -0,0 +1,247 @@
+"""数据库迁移
+
+迁移按版本号顺序执行，已执行的版本记录在 schema_migrations 表中。新数据库直接按当前模型建表并标记
+所有迁移为已执行；已有数据库只执行未记录的迁移。迁移在 `db_init` 的同一事务中执行，失败时整体回滚
+（SQLite 驱动只在第一条 DML 前自动开启事务，因此先显式执行 BEGIN，让 DDL 也能回滚）。
+
+新增迁移：在 MIGRATIONS 末尾追加一个版本号递增的 Migration，同时修改对应的模型定义。迁移中的表结构
+必须是写迁移时的副本（SQL 或本模块内的 Table 定义），不能引用会继续变化的模型。
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from loguru import logger
+from sqlalchemy import Column, Connection, Index, Integer, MetaData, String, Table, insert, inspect, select, text
+
+from app import settings
+from app.models import ModelBase, SchemaMigration
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _execute(conn: Connection, *statements: str) -> None:
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+# 迁移创建的表结构副本，与模型分开维护
+_frozen = MetaData()
+_import_checkpoints = Table(
+    "import_checkpoints",
+    _frozen,
+    Column("source", String(255), primary_key=True),
+    Column("position", Integer, nullable=False),
+    Column("created_at", Integer, nullable=False),
+    Column("updated_at", Integer, nullable=False),
+)
+_token_revocations = Table(
+    "token_revocations",
+    _frozen,
+    Column("jti", String(32), primary_key=True),
+    Column("expires_at", Integer, nullable=False),
+    Column("created_at", Integer, nullable=False),
+    Column("updated_at", Integer, nullable=False),
+    Index("ix_token_revocations_created_at", "created_at"),
+)
+
+_token_revocations_v2 = Table(
+    "token_revocations",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("jti", String(32), nullable=False, unique=True),
+    Column("expires_at", Integer, nullable=False),
+    Column("created_at", Integer, nullable=False),
+    Column("updated_at", Integer, nullable=False),
+    sqlite_autoincrement=True,
+)
+
+
+def create_missing_tables(conn: Connection) -> None:
+    """补建迁移系统引入前新增的表（import_checkpoints）"""
+    _import_checkpoints.create(conn, checkfirst=True)
+
+
+def add_hot_query_indexes(conn: Connection) -> None:
+    """列表键集分页与按作者、分类筛选的索引"""
+    _execute(
+        conn,
+        "CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_posts_author_id_created_at_id ON posts (author_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_posts_category_id_created_at_id ON posts (category_id, created_at, id)",
+    )
+
+
+def rebuild_posts_tags(conn: Connection) -> None:
+    """posts_tags 增加复合主键 (post_id, tag_id) 与 (tag_id, post_id) 索引
+
+    SQLite 不能给已有的表添加主键，因此新建表、复制去重后的数据再替换旧表。
+    """
+    _execute(
+        conn,
+        # 旧版本在 SQLite 上失败时可能遗留了中间表
+        "DROP TABLE IF EXISTS posts_tags_new",
+        """
+        CREATE TABLE posts_tags_new (
+            post_id INTEGER NOT NULL REFERENCES posts (id),
+            tag_id INTEGER NOT NULL REFERENCES tags (id),
+            PRIMARY KEY (post_id, tag_id)
+        )
+        """,
+        """
+        INSERT INTO posts_tags_new (post_id, tag_id)
+        SELECT DISTINCT post_id, tag_id FROM posts_tags WHERE post_id IS NOT NULL AND tag_id IS NOT NULL
+        """,
+        "DROP TABLE posts_tags",
+        "ALTER TABLE posts_tags_new RENAME TO posts_tags",
+        "CREATE INDEX ix_posts_tags_tag_id_post_id ON posts_tags (tag_id, post_id)",
+    )
+
+
+def create_token_revocations(conn: Connection) -> None:
+    """令牌吊销表"""
+    _token_revocations.create(conn, checkfirst=True)
+
+
+_POSTS_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def create_posts_search(conn: Connection) -> None:
+    """文章全文搜索：SQLite 创建 FTS5 外部内容表和同步触发器并重建索引，PostgreSQL 创建三元组索引"""
+    if conn.dialect.name == "sqlite":
+        _execute(
+            conn,
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                title, content, content='posts', content_rowid='id', tokenize='{settings.POST_FTS_TOKENIZER}'
+            )
+            """,
+            *_POSTS_FTS_TRIGGERS,
+            # 为已有文章建立索引
+            "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')",
+        )
+    elif conn.dialect.name == "postgresql":
+        _execute(
+            conn,
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE INDEX IF NOT EXISTS ix_posts_title_trgm ON posts USING gin (title gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS ix_posts_content_trgm ON posts USING gin (content gin_trgm_ops)",
+        )
+
+
+def make_post_category_optional(conn: Connection) -> None:
+    """posts.category_id 允许为空（文章可以不属于任何分类）
+
+    SQLite 不能修改列约束，因此重建 posts 表，并重建被一同删除的索引和全文索引同步触发器。
+    """
+    if conn.dialect.name != "sqlite":
+        _execute(conn, "ALTER TABLE posts ALTER COLUMN category_id DROP NOT NULL")
+        return
+    _execute(
+        conn,
+        "DROP TABLE IF EXISTS posts_new",
+        """
+        CREATE TABLE posts_new (
+            id INTEGER NOT NULL,
+            title VARCHAR(64) NOT NULL,
+            content TEXT NOT NULL,
+            author_id INTEGER NOT NULL,
+            category_id INTEGER,
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (title),
+            FOREIGN KEY(author_id) REFERENCES users (id),
+            FOREIGN KEY(category_id) REFERENCES categories (id)
+        )
+        """,
+        """
+        INSERT INTO posts_new (id, title, content, author_id, category_id, created_at, updated_at)
+        SELECT id, title, content, author_id, category_id, created_at, updated_at FROM posts
+        """,
+        "DROP TABLE posts",
+        "ALTER TABLE posts_new RENAME TO posts",
+    )
+    add_hot_query_indexes(conn)
+    # 文章 ID 不变，全文索引内容仍然有效，只需重建触发器
+    _execute(conn, *_POSTS_FTS_TRIGGERS)
+
+
+def add_token_revocation_ids(conn: Connection) -> None:
+    """token_revocations 改用自增 ID 作为主键（增量同步的游标），jti 改为唯一约束"""
+    _execute(
+        conn,
+        "DROP TABLE IF EXISTS token_revocations_old",
+        "ALTER TABLE token_revocations RENAME TO token_revocations_old",
+        "DROP INDEX IF EXISTS ix_token_revocations_created_at",
+    )
+    _token_revocations_v2.create(conn)
+    _execute(
+        conn,
+        """
+        INSERT INTO token_revocations (jti, expires_at, created_at, updated_at)
+        SELECT jti, expires_at, created_at, updated_at FROM token_revocations_old ORDER BY created_at
+        """,
+        "DROP TABLE token_revocations_old",
+    )
+
+
+MIGRATIONS = [
+    Migration(1, "create_missing_tables", create_missing_tables),
+    Migration(2, "add_hot_query_indexes", add_hot_query_indexes),
+    Migration(3, "rebuild_posts_tags", rebuild_posts_tags),
+    Migration(4, "create_token_revocations", create_token_revocations),
+    Migration(5, "create_posts_search", create_posts_search),
+    Migration(6, "make_post_category_optional", make_post_category_optional),
+    Migration(7, "add_token_revocation_ids", add_token_revocation_ids),
+]
+
+
+def _record(conn: Connection, migrations: list[Migration]) -> None:
+    if migrations:
+        conn.execute(insert(SchemaMigration), [{"version": m.version, "name": m.name} for m in migrations])
+
+
+def run_migrations(conn: Connection) -> list[int]:
+    """执行未执行的迁移，返回本次执行的版本号（在 `AsyncConnection.run_sync` 中调用）"""
+    if conn.dialect.name == "sqlite" and not conn.connection.driver_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN")
+    tables = set(inspect(conn).get_table_names())
+    if not tables & {table.name for table in ModelBase.metadata.sorted_tables}:
+        # 新数据库：按当前模型建表，所有迁移视为已执行
+        ModelBase.metadata.create_all(conn)
+        _record(conn, MIGRATIONS)
+        return []
+
+    if SchemaMigration.__tablename__ not in tables:
+        SchemaMigration.__table__.create(conn)
+    applied = set(conn.execute(select(SchemaMigration.version)).scalars())
+    pending = [migration for migration in MIGRATIONS if migration.version not in applied]
+    for migration in pending:
+        logger.info(f"执行数据库迁移 {migration.version:04d}_{migration.name}")
+        migration.upgrade(conn)
+    _record(conn, pending)
+    return [migration.version for migration in pending]
@@ -0,0 +1,54 @@
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
+
+import ujson
+
+from app.core import exceptions
+
+T = TypeVar("T")
+
+# 数据库整数列的取值范围
+MIN_INT64 = -(2**63)
+MAX_INT64 = 2**63 - 1
+
+
+def encode_cursor(*values: Any) -> str:
+    """将排序键编码为不透明的分页游标"""
+    raw = ujson.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """解码分页游标
+
+    - types: 各排序键的类型，数量或类型不匹配时视为无效游标（避免无法绑定的值进入查询）
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = ujson.loads(raw)
+    except (binascii.Error, ValueError):
+        raise exceptions.INVALID_CURSOR
+    if not isinstance(values, list) or len(values) != len(types):
+        raise exceptions.INVALID_CURSOR
+    for value, expected in zip(values, types, strict=True):
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise exceptions.INVALID_CURSOR
+        if isinstance(value, int) and not MIN_INT64 <= value <= MAX_INT64:
+            raise exceptions.INVALID_CURSOR
+    return tuple(values)
+
+
+def split_page(  # noqa: UP047 保持 Python 3.11 可导入
+    rows: Sequence[T], per_page: int, key: Callable[[T], tuple]
+) -> tuple[list[T], str | None]:
+    """切分多查询一条的结果，返回本页数据与下一页游标
+
+    查询时应使用 `limit=per_page + 1`，多出的一条表示还有下一页。
+    """
+    rows = list(rows)
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import settings
+from app.core.bus import bus
+from app.core.cache import token_cache
+from app.core.files import atomic_write
+from app.core.revocations import revocations
+from app.core.security import verify_token
+
+PROFILE_HEADER = "x-profile"
+
+
+class SamplingProfiler:
+    """采样分析器
+
+    后台线程按固定间隔读取所有线程（事件循环与工作线程池）的调用栈，
+    输出 flamegraph.pl / speedscope 可直接读取的折叠栈格式（`线程;函数;函数 次数`）。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def folded(self) -> bytes:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common()).encode()
+
+
+class ProfilingState:
+    """分析开关：超级管理员的请求头，或限时开启（按路径前缀匹配）"""
+
+    def __init__(self):
+        self.enabled_until = 0.0
+        self.path_prefix = ""
+        # 同一进程同时只采样一个请求
+        self.lock = threading.Lock()
+
+    def enable(self, seconds: float, path_prefix: str = "") -> None:
+        bus.publish("profile", f"{time.time() + seconds}|{path_prefix}")
+
+    def disable(self) -> None:
+        bus.publish("profile", "0|")
+
+    def apply(self, key: str) -> None:
+        """处理开关消息（各工作进程同步）"""
+        until, _, path_prefix = key.partition("|")
+        self.enabled_until = float(until)
+        self.path_prefix = path_prefix
+
+    @property
+    def active(self) -> bool:
+        return self.enabled_until > time.time()
+
+    def status(self) -> dict:
+        return {
+            "active": self.active,
+            "enabled_until": self.enabled_until if self.active else None,
+            "path_prefix": self.path_prefix,
+        }
+
+
+profiling = ProfilingState()
+bus.subscribe("profile", profiling.apply)
+
+
+def list_profiles() -> list[Path]:
+    """已保存的分析结果，最新的在前"""
+    if not settings.PROFILE_DIR.exists():
+        return []
+    return sorted(settings.PROFILE_DIR.glob("*.folded"), key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def save_profile(name: str, data: bytes) -> None:
+    atomic_write(settings.PROFILE_DIR / name, data)
+    for path in list_profiles()[settings.PROFILE_MAX_FILES :]:
+        path.unlink(missing_ok=True)
+
+
+def _header_requested(headers: Headers) -> bool:
+    """请求头开启分析时，只接受超级管理员（power >= 3）的令牌"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    token_data = token_cache.get(token) or verify_token(token)
+    return token_data is not None and token_data.power >= 3 and not revocations.is_revoked(token_data.jti)
+
+
+class ProfilingMiddleware:
+    """对匹配的请求采样，结果保存为折叠栈文件，文件名通过 `X-Profile-Id` 响应头返回
+
+    未开启时每个请求只多一次请求头查找和时间比较。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if profiling.active and scope["path"].startswith(profiling.path_prefix):
+            return True
+        headers = Headers(scope=scope)
+        return PROFILE_HEADER in headers and _header_requested(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not profiling.lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        path = re.sub(r"[^A-Za-z0-9_.-]+", "-", scope["path"].strip("/"))[:80] or "root"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{scope['method']}_{path}_{uuid.uuid4().hex[:8]}.folded"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = name
+            await send(message)
+
+        profiler = SamplingProfiler(interval=settings.PROFILE_INTERVAL)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 等待采样线程退出和写文件（含轮转时的 stat）都在线程中执行，不阻塞事件循环
+            try:
+                await asyncio.to_thread(profiler.stop)
+            finally:
+                profiling.lock.release()
+            try:
+                await asyncio.to_thread(save_profile, name, profiler.folded())
+            except OSError as e:
+                logger.error(f"保存分析结果错误 {name}: {e}")
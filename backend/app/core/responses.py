@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson  # 可选依赖，未安装时使用 pydantic-core 序列化
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """应用默认的 JSON 响应类
+
+    使用 orjson（或 pydantic-core）直接序列化为字节，替代标准库 json。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return to_json(content)
+
+
+@lru_cache(maxsize=128)
+def get_adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def dump_model(model: Any, obj: Any) -> bytes:
+    """按响应模型将 ORM 对象（或字典）校验一次并直接序列化为 JSON 字节"""
+    adapter = get_adapter(model)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
+
+def model_response(model: Any, obj: Any, *, status_code: int = 200) -> Response:
+    """返回已序列化的响应模型
+
+    路由直接返回 Response 时 FastAPI 跳过 response_model 的二次校验和 jsonable_encoder，
+    `response_model` 仍保留在装饰器中用于生成文档。
+    """
+    return Response(content=dump_model(model, obj), status_code=status_code, media_type="application/json")
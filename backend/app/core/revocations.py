@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import math
+import time
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import crud, settings
+from app.core.bus import bus
+from app.core.database import read_session, unit_of_work
+
+
+class BloomFilter:
+    """布隆过滤器：不存在时一定返回 False，存在时可能误判（误判率约为 error_rate）"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))  # 位数
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        # 双重哈希：由一次 blake2b 摘要派生 k 个位置
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """内存中的令牌吊销列表
+
+    布隆过滤器快速排除绝大多数未吊销的令牌，命中时再查精确集合，验证令牌无需查询数据库。
+    吊销时通过缓存失效总线立即通知各工作进程，并定期按自增 ID 从 token_revocations 表增量同步，
+    补上进程启动前或广播丢失的记录；过期的记录定期清理并重建过滤器。
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        error_rate: float,
+        sync_seconds: float,
+        id_window: int = 0,
+        full_sync_seconds: float = math.inf,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.id_window = id_window
+        self.full_sync_seconds = full_sync_seconds
+        self._expires: dict[str, int] = {}  # jti -> 令牌过期时间
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._last_id = 0  # 已同步的最大吊销记录 ID
+        self._full_synced_at = -math.inf  # 上次全量同步的时间（time.monotonic）
+        self._task: asyncio.Task | None = None
+
+    def add(self, jti: str, expires_at: int) -> None:
+        if expires_at <= time.time():
+            return
+        self._expires[jti] = expires_at
+        self._bloom.add(jti)
+        if len(self._expires) > self._bloom.capacity:
+            self._rebuild()
+
+    def is_revoked(self, jti: str | None) -> bool:
+        return jti is not None and jti in self._bloom and jti in self._expires
+
+    def apply(self, key: str) -> None:
+        """处理吊销消息 `{jti}|{过期时间}`"""
+        jti, _, expires_at = key.partition("|")
+        self.add(jti, int(expires_at))
+
+    def prune(self) -> None:
+        """清理已过期的记录（过期令牌本身已无法通过验证），并重建过滤器"""
+        now = time.time()
+        expired = [jti for jti, expires_at in self._expires.items() if expires_at <= now]
+        if expired:
+            for jti in expired:
+                del self._expires[jti]
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        bloom = BloomFilter(max(self.capacity, len(self._expires) * 2), self.error_rate)
+        for jti in self._expires:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def sync(self) -> None:
+        """从数据库增量加载吊销记录
+
+        以自增 ID 为游标，不受提交时间与写入时间戳先后的影响。SQLite 写事务串行，ID 按提交顺序递增；
+        PostgreSQL 等数据库在插入时分配序列 ID，先插入、后提交的记录可能落在已同步的游标之前，
+        因此每次重读游标之前的 `id_window` 条，并每隔 `full_sync_seconds` 全量同步一次（`add` 是幂等的）。
+        """
+        now = time.monotonic()
+        async with read_session() as session:
+            full = session.get_bind().dialect.name != "sqlite" and now - self._full_synced_at >= self.full_sync_seconds
+            after_id = 0 if full else max(0, self._last_id - self.id_window)
+            rows = await crud.get_revocations(session=session, after_id=after_id)
+        if full:
+            self._full_synced_at = now
+        for id, jti, expires_at in rows:
+            self.add(jti, expires_at)
+            self._last_id = max(self._last_id, id)
+        self.prune()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync()
+            except SQLAlchemyError as e:
+                logger.error(f"同步令牌吊销列表错误: {e}")
+
+    async def start(self) -> None:
+        async with unit_of_work() as session:
+            await crud.delete_expired_revocations(session=session)
+        await self.sync()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, int]:
+        return {"revoked": len(self._expires), "bloom_bits": self._bloom.size}
+
+
+revocations = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+    id_window=settings.REVOCATION_SYNC_ID_WINDOW,
+    full_sync_seconds=settings.REVOCATION_FULL_SYNC_SECONDS,
+)
+bus.subscribe("revoke", revocations.apply)
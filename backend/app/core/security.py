@@ -1,14 +1,24 @@
 import time
+import uuid
 from datetime import timedelta
-from typing import Any
+from typing import Any, Literal
 
 import bcrypt
-from jose import JWTError, jwt
+from pydantic import ValidationError
 
 from app import settings
+from app.core.executors import BoundedExecutor
+from app.core.tokens import decode_jwt, encode_jwt, keyring
 from app.schemas.tokens import TokenData
 
-ALGORITHM = "HS256"
+TokenType = Literal["access", "refresh"]
+
+password_hasher = BoundedExecutor(
+    name="password_hash",
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,16 +32,34 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    """验证哈希（在密码哈希工作池中执行）"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def async_get_password_hash(password: str) -> str:
+    """生成哈希（在密码哈希工作池中执行）"""
+    return await password_hasher.run(get_password_hash, password)
+
+
+def _create_token(data: dict[str, Any], typ: TokenType, expires_delta: timedelta) -> str:
+    to_encode = data.copy()  # 需要编码进 JWT 的数据
+    to_encode.update(
+        {
+            "exp": int(time.time() + expires_delta.total_seconds()),  # 过期时间(UTC 时间戳)
+            "jti": uuid.uuid4().hex,  # 令牌唯一 ID，用于吊销
+            "typ": typ,  # 访问令牌与刷新令牌不能互换使用
+        }
+    )
+    return encode_jwt(to_encode, keyring)
+
+
 def create_access_token(
     data: dict[str, Any],
     expires_delta: timedelta = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS),
 ) -> str:
     """生成访问令牌"""
-    to_encode = data.copy()  # 需要编码进 JWT 的数据
-    expire = int(time.time()) + expires_delta.total_seconds()  # 过期时间(UTC 时间戳)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _create_token(data, "access", expires_delta)
 
 
 def create_refresh_token(
@@ -39,21 +67,21 @@ def create_refresh_token(
     expires_delta: timedelta = timedelta(seconds=settings.REFRESH_TOKEN_EXPIRE_SECONDS),
 ) -> str:
     """生成刷新令牌"""
-    to_encode = data.copy()
-    expire = int(time.time()) + expires_delta.total_seconds()
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _create_token(data, "refresh", expires_delta)
 
 
-def verify_token(token: str) -> TokenData | None:
-    """验证令牌"""
+def verify_token(token: str, typ: TokenType = "access") -> TokenData | None:
+    """验证令牌（签名、过期时间与类型，不含吊销检查）"""
+    payload = decode_jwt(token, keyring)
+    # 类型引入前签发的令牌没有 typ，无法区分访问令牌和刷新令牌，只作为刷新令牌接受（换取新的令牌），
+    # 避免 7 天有效期的旧刷新令牌被当作访问令牌使用
+    if payload is None or payload.get("typ", "refresh") != typ:
+        return None
+    id = payload.get("sub")
+    power = payload.get("power")
+    if id is None or power is None:
+        return None
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        id: int = payload.get("sub")
-        power: int = payload.get("power")
-        if id is None or power is None:
-            return None
-        return TokenData(id=id, power=power)
-    except JWTError:
+        return TokenData(id=id, power=power, exp=payload.get("exp"), jti=payload.get("jti"))
+    except ValidationError:
         return None
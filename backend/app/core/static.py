@@ -0,0 +1,204 @@
+import gzip
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+
+import anyio
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Message, Receive, Scope, Send
+
+from app.core.files import atomic_write
+
+try:
+    import brotli  # 可选依赖，未安装时只生成 gzip 版本
+except ImportError:
+    brotli = None
+
+# 值得压缩的文本类型，图片、视频、字体等二进制媒体本身已经压缩
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".wasm"}
+# 文件名中包含 32 位十六进制哈希（如头像 `{id}_{uuid}.webp`）的文件内容不会变化，可以永久缓存
+IMMUTABLE_NAME = re.compile(r"[0-9a-f]{32}")
+MIN_COMPRESS_SIZE = 1024
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """按 Accept-Encoding 的 q 值判断是否接受某种编码（`br;q=0` 表示拒绝，未列出时看 `*`）"""
+    wildcard = None
+    for item in accept_encoding.lower().split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == coding:
+            return q > 0
+        if name == "*":
+            wildcard = q > 0
+    return bool(wildcard)
+
+
+def precompress_file(path: Path) -> None:
+    """为文本类静态文件生成 .br / .gz 预压缩版本"""
+    if path.suffix not in COMPRESSIBLE_SUFFIXES or path.stat().st_size < MIN_COMPRESS_SIZE:
+        return
+    data = path.read_bytes()
+    atomic_write(path.with_name(f"{path.name}.gz"), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        atomic_write(path.with_name(f"{path.name}.br"), brotli.compress(data, quality=11))
+
+
+def precompress_static_dir(directory: Path) -> None:
+    """为静态目录中缺失或过期的文件生成预压缩版本（启动时执行）"""
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = Path(root) / name
+            if path.suffix not in COMPRESSIBLE_SUFFIXES:
+                continue
+            variant = path.with_name(f"{name}.gz")
+            try:
+                if not variant.exists() or variant.stat().st_mtime < path.stat().st_mtime:
+                    precompress_file(path)
+            except OSError as e:
+                logger.error(f"预压缩静态文件错误 {path}: {e}")
+
+
+class StaticFileResponse(FileResponse):
+    """支持 ASGI `http.response.pathsend` 扩展的文件响应，服务器支持时由其直接 sendfile
+
+    HEAD 与范围请求交给 FileResponse 处理；外层的 GZip 中间件需要转发 pathsend 消息（见 MediaAwareGZipMiddleware）。
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            "http.response.pathsend" not in scope.get("extensions", {})
+            or scope["method"].upper() == "HEAD"
+            or "range" in Headers(scope=scope)
+        ):
+            await super().__call__(scope, receive, send)
+            return
+        if self.stat_result is None:
+            # 与 FileResponse 一致：未传入 stat_result 时在线程中获取，设置 Content-Length、ETag、Last-Modified
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(self.stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.set_stat_headers(self.stat_result)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+        if self.background is not None:
+            await self.background()
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """静态文件服务
+
+    - 根据 Accept-Encoding 返回预先生成的 .br / .gz 文件，不在请求时压缩
+    - 文件名带内容哈希的文件设置一年的 immutable 缓存，其他文件每次协商缓存
+    """
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = Path(full_path)
+        headers = {"Vary": "Accept-Encoding"}
+        if IMMUTABLE_NAME.search(full_path.name):
+            headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            headers["Cache-Control"] = "public, no-cache"
+
+        path = full_path
+        accept_encoding = request_headers.get("accept-encoding", "")
+        if full_path.suffix in COMPRESSIBLE_SUFFIXES:
+            for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if not accepts_encoding(accept_encoding, candidate):
+                    continue
+                variant = full_path.with_name(full_path.name + suffix)
+                try:
+                    variant_stat = variant.stat()
+                except OSError:
+                    continue
+                # 原文件更新后、重新预压缩前，旧的压缩版本不能使用
+                if stat.S_ISREG(variant_stat.st_mode) and variant_stat.st_mtime >= stat_result.st_mtime:
+                    path, stat_result = variant, variant_stat
+                    headers["Content-Encoding"] = candidate
+                    break
+
+        response = StaticFileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            stat_result=stat_result,
+            # 压缩版本保留原文件的类型
+            media_type=mimetypes.guess_type(full_path.name)[0] or "text/plain",
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class PathsendIdentityResponder(IdentityResponder):
+    """不压缩时原样转发 pathsend 消息（Starlette 的响应器只处理 http.response.body，会丢弃该消息）"""
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] != "http.response.pathsend":
+            await super().send_with_compression(message)
+            return
+        if not self.started:
+            self.started = True
+            await self.send(self.initial_message)
+        await self.send(message)
+
+
+class MediaAwareGZipResponder(PathsendIdentityResponder, GZipResponder):
+    """跳过图片、视频等已压缩的二进制媒体"""
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.pathsend" and not (
+            self.content_encoding_set or self.content_type_is_excluded
+        ):
+            # 需要压缩：读取文件内容，按普通响应体压缩
+            body = await anyio.Path(message["path"]).read_bytes()
+            message = {"type": "http.response.body", "body": body, "more_body": False}
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.content_type_is_excluded = self.content_type_is_excluded or not is_compressible(content_type)
+
+
+class MediaAwareGZipMiddleware(GZipMiddleware):
+    """只压缩文本类响应的 GZip 中间件"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        responder: PathsendIdentityResponder
+        if accepts_encoding(Headers(scope=scope).get("Accept-Encoding", ""), "gzip"):
+            responder = MediaAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = PathsendIdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
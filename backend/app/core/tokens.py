@@ -0,0 +1,73 @@
+import base64
+import hashlib
+import hmac
+import time
+from typing import Any
+
+import ujson
+
+from app import settings
+
+ALGORITHM = "HS256"
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class KeyRing:
+    """带版本的签名密钥
+
+    新令牌使用当前密钥签名，头部 `kid` 标识密钥版本；轮换时将旧密钥移入 previous，
+    旧密钥签发的令牌在过期前仍可验证。没有 `kid` 的令牌（轮换功能引入前签发）按当前密钥验证。
+    """
+
+    def __init__(self, current_kid: str, current_key: str, previous: dict[str, str] | None = None):
+        self.current_kid = current_kid
+        self.keys = {kid: key.encode() for kid, key in (previous or {}).items()}
+        self.keys[current_kid] = current_key.encode()
+        # 编码后的头部只计算一次
+        self.header = b64url_encode(ujson.dumps({"alg": ALGORITHM, "typ": "JWT", "kid": current_kid}).encode())
+
+    def key_for(self, kid: str | None) -> bytes | None:
+        return self.keys.get(self.current_kid if kid is None else kid)
+
+
+def encode_jwt(payload: dict[str, Any], keyring: KeyRing) -> str:
+    """HS256 签名（仅依赖标准库 hmac，与 PyJWT / python-jose 的输出兼容）"""
+    signing_input = keyring.header + b"." + b64url_encode(ujson.dumps(payload).encode())
+    signature = hmac.new(keyring.keys[keyring.current_kid], signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + b64url_encode(signature)).decode("ascii")
+
+
+def decode_jwt(token: str, keyring: KeyRing, *, now: float | None = None) -> dict[str, Any] | None:
+    """验证签名与过期时间，返回载荷；任何格式错误、签名不符或已过期都返回 None"""
+    try:
+        header_segment, payload_segment, signature_segment = token.encode("ascii").split(b".")
+        header = ujson.loads(b64url_decode(header_segment))
+        if header.get("alg") != ALGORITHM:
+            return None
+        key = keyring.key_for(header.get("kid"))
+        if key is None:
+            return None
+        expected = hmac.new(key, header_segment + b"." + payload_segment, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, b64url_decode(signature_segment)):
+            return None
+        payload = ujson.loads(b64url_decode(payload_segment))
+    except (ValueError, UnicodeError, AttributeError, TypeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    exp = payload.get("exp")
+    if exp is not None and (not isinstance(exp, int | float) or exp <= (time.time() if now is None else now)):
+        return None
+    return payload
+
+
+keyring = KeyRing(settings.SECRET_KEY_ID, settings.SECRET_KEY, settings.PREVIOUS_SECRET_KEYS)
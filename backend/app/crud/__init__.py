@@ -1,3 +1,16 @@
+from app.crud.posts import (
+    create_post,
+    delete_post,
+    get_category,
+    get_missing_tag_ids,
+    get_post,
+    get_post_by_title,
+    get_post_count,
+    get_post_list,
+    search_posts,
+    update_post,
+)
+from app.crud.tokens import delete_expired_revocations, get_revocations, revoke_tokens
 from app.crud.users import (
     authenticate_user,
     create_user,
@@ -7,6 +20,7 @@ from app.crud.users import (
     get_user_by_username_or_email,
     get_user_count,
     get_user_list,
+    get_users_by_ids,
     update_user,
 )
 
@@ -15,9 +29,23 @@ __all__ = [
     create_user,
     update_user,
     get_user,
+    get_users_by_ids,
     get_user_by_email,
     get_user_by_username,
     get_user_by_username_or_email,
     get_user_count,
     get_user_list,
+    create_post,
+    update_post,
+    delete_post,
+    get_post,
+    get_post_by_title,
+    get_post_count,
+    get_post_list,
+    search_posts,
+    get_category,
+    get_missing_tag_ids,
+    revoke_tokens,
+    get_revocations,
+    delete_expired_revocations,
 ]
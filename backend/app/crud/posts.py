@@ -0,0 +1,220 @@
+import re
+from time import time
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.bus import bus
+from app.core.counts import count_cache
+from app.core.database import after_commit
+from app.models import Category, Post, Tag, posts_fts, posts_tags
+from app.schemas.posts import PostCreate, PostUpdate
+
+
+def _with_relations(stmt: Select) -> Select:
+    """预加载作者、分类（JOIN）和标签（IN 查询），列表与详情都只需 2 次查询"""
+    return stmt.options(joinedload(Post.author), joinedload(Post.category), selectinload(Post.tags))
+
+
+def _filter_posts(
+    stmt: Select, *, category_id: int | None = None, tag_id: int | None = None, author_id: int | None = None
+) -> Select:
+    if category_id is not None:
+        stmt = stmt.where(Post.category_id == category_id)
+    if author_id is not None:
+        stmt = stmt.where(Post.author_id == author_id)
+    if tag_id is not None:
+        stmt = stmt.where(Post.id.in_(select(posts_tags.c.post_id).where(posts_tags.c.tag_id == tag_id)))
+    return stmt
+
+
+async def _sync_post_tags(*, session: AsyncSession, post_id: int, tag_ids: list[int], is_new: bool = False) -> None:
+    """同步文章标签：与现有关联求差集后，批量删除和批量插入"""
+    wanted = set(tag_ids)
+    current = set()
+    if not is_new:
+        result = await session.execute(select(posts_tags.c.tag_id).where(posts_tags.c.post_id == post_id))
+        current = set(result.scalars())
+    if to_remove := current - wanted:
+        await session.execute(
+            delete(posts_tags).where(posts_tags.c.post_id == post_id, posts_tags.c.tag_id.in_(to_remove))
+        )
+    if to_add := wanted - current:
+        await session.execute(insert(posts_tags), [{"post_id": post_id, "tag_id": tag_id} for tag_id in to_add])
+
+
+def _invalidate_posts(id: int | None = None, count_delta: int = 0) -> None:
+    """使文章相关缓存失效（事务提交后执行）"""
+    if count_delta:
+        count_cache.incr("posts", count_delta)
+        bus.publish("count", "posts")
+    if id is not None:
+        bus.publish("tag", f"post:{id}")
+    bus.publish("tag", "posts")
+
+
+async def create_post(*, session: AsyncSession, author_id: int, post_create: PostCreate) -> Post:
+    """创建文章"""
+    result = await session.execute(
+        insert(Post).values(author_id=author_id, **post_create.model_dump(exclude={"tag_ids"})).returning(Post.id)
+    )
+    post_id = result.scalar_one()
+    await _sync_post_tags(session=session, post_id=post_id, tag_ids=post_create.tag_ids, is_new=True)
+    after_commit(session, lambda: _invalidate_posts(count_delta=1))
+    return await get_post(session=session, id=post_id)
+
+
+async def update_post(*, session: AsyncSession, id: int, post_update: PostUpdate) -> Post | None:
+    """更新文章"""
+    values = post_update.model_dump(exclude_unset=True, exclude={"tag_ids"})
+    # 只更新标签时也刷新更新时间
+    await session.execute(update(Post).where(Post.id == id).values(**values or {"updated_at": int(time())}))
+    if post_update.tag_ids is not None:
+        await _sync_post_tags(session=session, post_id=id, tag_ids=post_update.tag_ids)
+    after_commit(session, lambda: _invalidate_posts(id))
+    return await get_post(session=session, id=id)
+
+
+async def delete_post(*, session: AsyncSession, id: int) -> None:
+    """删除文章"""
+    await session.execute(delete(posts_tags).where(posts_tags.c.post_id == id))
+    result = await session.execute(delete(Post).where(Post.id == id))
+    after_commit(session, lambda: _invalidate_posts(id, count_delta=-result.rowcount))
+
+
+async def get_post(*, session: AsyncSession, id: int) -> Post | None:
+    stmt = _with_relations(select(Post).where(Post.id == id)).execution_options(populate_existing=True)
+    result = await session.execute(stmt)
+    return result.scalars().first()
+
+
+async def get_post_by_title(*, session: AsyncSession, title: str) -> Post | None:
+    result = await session.execute(select(Post).where(Post.title == title))
+    return result.scalars().first()
+
+
+async def get_post_count(
+    *, session: AsyncSession, category_id: int | None = None, tag_id: int | None = None, author_id: int | None = None
+) -> int:
+    """获取文章总数（无筛选条件时使用缓存）"""
+
+    async def count() -> int:
+        stmt = _filter_posts(select(func.count(Post.id)), category_id=category_id, tag_id=tag_id, author_id=author_id)
+        result = await session.execute(stmt)
+        return result.scalar()
+
+    if category_id is None and tag_id is None and author_id is None:
+        return await count_cache.get("posts", count)
+    return await count()
+
+
+async def get_post_list(
+    *,
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[int, int] | None = None,
+    category_id: int | None = None,
+    tag_id: int | None = None,
+    author_id: int | None = None,
+) -> list[Post]:
+    """获取文章列表，按 (created_at, id) 倒序（最新的在前）
+
+    - after: 键集分页的起点 (created_at, id)，传入时忽略 skip
+    """
+    stmt = select(Post).order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+    stmt = _filter_posts(stmt, category_id=category_id, tag_id=tag_id, author_id=author_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    else:
+        stmt = stmt.offset(skip)
+    result = await session.execute(_with_relations(stmt).execution_options(populate_existing=True))
+    return result.unique().scalars().all()
+
+
+def build_fts_query(q: str) -> str:
+    """将用户输入转换为 FTS5 查询：每个词作为短语加引号，词之间为 AND"""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in q.split())
+
+
+def _like_pattern(term: str) -> str:
+    return "%{}%".format(term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_"))
+
+
+def _fallback_search_columns(q: str) -> tuple[ColumnElement[float], ColumnElement[str], list[ColumnElement[bool]]]:
+    """不支持 FTS5 的数据库（PostgreSQL）：每个词对标题或正文做不区分大小写的子串匹配（可由 pg_trgm 索引加速），
+    以词的出现次数作为相关度，返回 (相关度, 摘要, 过滤条件)
+    """
+    terms = q.split()
+    text = func.lower(Post.title + " " + Post.content)
+    occurrences = [
+        (func.length(text) - func.length(func.replace(text, term.lower(), ""))) / len(term) for term in terms
+    ]
+    rank = cast(-sum(occurrences[1:], occurrences[0]), Float)
+    start = func.greatest(func.strpos(func.lower(Post.content), terms[0].lower()) - 32, 1)
+    highlight = "({})".format("|".join(re.escape(term) for term in terms))
+    snippet = func.regexp_replace(func.substr(Post.content, start, 96), highlight, "<mark>\\&</mark>", "gi")
+    conditions = [
+        or_(Post.title.ilike(_like_pattern(term), escape="\\"), Post.content.ilike(_like_pattern(term), escape="\\"))
+        for term in terms
+    ]
+    return rank, snippet, conditions
+
+
+async def search_posts(
+    *,
+    session: AsyncSession,
+    q: str,
+    limit: int = 20,
+    after: tuple[float, int] | None = None,
+    category_id: int | None = None,
+    tag_id: int | None = None,
+) -> list[tuple[Post, float, str]]:
+    """全文搜索文章，按相关度（bm25）排序，返回 (文章, 相关度, 摘要)
+
+    - after: 键集分页的起点 (rank, id)
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        fts = literal_column("posts_fts")
+        rank = posts_fts.c.rank
+        snippet = func.snippet(fts, -1, "<mark>", "</mark>", "…", 32)
+        stmt = (
+            select(Post, rank, snippet)
+            .join(posts_fts, posts_fts.c.rowid == Post.id)
+            .where(fts.match(build_fts_query(q)))
+        )
+    else:
+        rank, snippet, conditions = _fallback_search_columns(q)
+        stmt = select(Post, rank, snippet).where(*conditions)
+    stmt = _filter_posts(stmt.order_by(rank, Post.id).limit(limit), category_id=category_id, tag_id=tag_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Post.id) > tuple_(*after))
+    result = await session.execute(_with_relations(stmt).execution_options(populate_existing=True))
+    return [tuple(row) for row in result.unique().all()]
+
+
+async def get_missing_tag_ids(*, session: AsyncSession, tag_ids: list[int]) -> set[int]:
+    """返回不存在的标签 ID"""
+    if not tag_ids:
+        return set()
+    result = await session.execute(select(Tag.id).where(Tag.id.in_(set(tag_ids))))
+    return set(tag_ids) - set(result.scalars())
+
+
+async def get_category(*, session: AsyncSession, id: int) -> Category | None:
+    category = await session.get(Category, id)
+    return category
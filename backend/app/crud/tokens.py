@@ -0,0 +1,44 @@
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bus import bus
+from app.core.database import after_commit
+from app.models.tokens import TokenRevocation
+from app.schemas.tokens import TokenData
+
+
+def _publish_revocations(revoked: list[TokenData]) -> None:
+    """通知各工作进程更新内存中的吊销列表（事务提交后执行）"""
+    bus.publish("revoke", *(f"{token.jti}|{token.exp}" for token in revoked))
+
+
+async def revoke_tokens(*, session: AsyncSession, tokens: list[TokenData]) -> None:
+    """吊销令牌（没有 jti 的旧令牌无法吊销，只能等待过期）；已吊销的令牌忽略"""
+    revoked = [token for token in tokens if token.jti and token.exp]
+    if not revoked:
+        return
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    await session.execute(
+        dialect.insert(TokenRevocation).on_conflict_do_nothing(index_elements=["jti"]),
+        [{"jti": token.jti, "expires_at": token.exp} for token in revoked],
+    )
+    after_commit(session, lambda: _publish_revocations(revoked))
+
+
+async def get_revocations(*, session: AsyncSession, after_id: int = 0) -> list[tuple[int, str, int]]:
+    """获取 ID 大于 after_id 且尚未过期的吊销记录 (ID, jti, 过期时间)，按 ID 排序"""
+    result = await session.execute(
+        select(TokenRevocation.id, TokenRevocation.jti, TokenRevocation.expires_at)
+        .where(TokenRevocation.id > after_id, TokenRevocation.expires_at > int(time.time()))
+        .order_by(TokenRevocation.id)
+    )
+    return result.all()
+
+
+async def delete_expired_revocations(*, session: AsyncSession) -> int:
+    """删除已过期的吊销记录（过期令牌本身已无法通过验证）"""
+    result = await session.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= int(time.time())))
+    return result.rowcount
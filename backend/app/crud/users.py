@@ -1,74 +1,105 @@
 from pydantic import EmailStr
-from sqlalchemy import func, select, update
+from sqlalchemy import func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.bus import bus
+from app.core.counts import count_cache
+from app.core.database import after_commit
+from app.core.security import async_get_password_hash, async_verify_password
 from app.models.users import User
 from app.schemas.users import UserCreate, UserUpdate
 
 
+def _invalidate_users(id: int | None = None) -> None:
+    """使用户相关缓存失效（事务提交后执行）"""
+    if id is None:  # 新增用户
+        count_cache.incr("users")
+        bus.publish("count", "users")
+    else:
+        bus.publish("user", id)  # 用户信息（含权限）变更后使缓存的快照失效
+        bus.publish("tag", f"user:{id}")
+    bus.publish("tag", "users")
+
+
 async def create_user(*, session: AsyncSession, user_create: UserCreate) -> User:
     """创建用户"""
     user_data = user_create.model_dump(exclude={"password"})
-    user_data["hashed_password"] = get_password_hash(user_create.password)
-
-    async with session.begin():
-        new_user = User(**user_data)
-        session.add(new_user)
-        await session.flush()  # 推送更改到数据库（生成ID等）
-        await session.refresh(new_user)  # 刷新获取数据库默认值
+    user_data["hashed_password"] = await async_get_password_hash(user_create.password)
 
+    new_user = User(**user_data)
+    session.add(new_user)
+    await session.flush()  # 推送更改到数据库（生成ID等）
+    await session.refresh(new_user)  # 刷新获取数据库默认值
+    after_commit(session, _invalidate_users)
     return new_user
 
 
 async def update_user(*, session: AsyncSession, id: int, user_update: UserUpdate) -> User | None:
     """更新用户"""
-    async with session.begin():
-        stmt = update(User).where(User.id == id).values(**user_update.model_dump(exclude_unset=True)).returning(User)
-        result = await session.execute(stmt)
+    stmt = update(User).where(User.id == id).values(**user_update.model_dump(exclude_unset=True)).returning(User)
+    result = await session.execute(stmt)
+    after_commit(session, lambda: _invalidate_users(id))
     return result.scalar_one_or_none()
 
 
 async def get_user(*, session: AsyncSession, id: int) -> User | None:
-    async with session.begin():
-        user = await session.get(User, id)
+    user = await session.get(User, id)
     return user
 
 
+async def get_users_by_ids(*, session: AsyncSession, ids: list[int]) -> list[User]:
+    """批量获取用户（一次 IN 查询，结果不保证顺序）"""
+    if not ids:
+        return []
+    result = await session.execute(select(User).where(User.id.in_(set(ids))))
+    return result.scalars().all()
+
+
 async def get_user_by_email(*, session: AsyncSession, email: EmailStr) -> User | None:
-    async with session.begin():
-        result = await session.execute(select(User).where(User.email == email))
+    result = await session.execute(select(User).where(User.email == email))
     return result.scalars().first()
 
 
 async def get_user_by_username(*, session: AsyncSession, username: str) -> User | None:
-    async with session.begin():
-        result = await session.execute(select(User).where(User.username == username))
+    result = await session.execute(select(User).where(User.username == username))
     return result.scalars().first()
 
 
 async def get_user_by_username_or_email(*, session: AsyncSession, username_or_email: str) -> User | None:
-    async with session.begin():
-        result = await session.execute(
-            select(User).where((User.username == username_or_email) | (User.email == username_or_email))
-        )
+    result = await session.execute(
+        select(User).where((User.username == username_or_email) | (User.email == username_or_email))
+    )
     return result.scalars().first()
 
 
 async def get_user_count(*, session: AsyncSession) -> int:
-    async with session.begin():
+    """获取用户总数（缓存，定期与数据库对账）"""
+
+    async def count() -> int:
         result = await session.execute(select(func.count(User.id)))
-    return result.scalar()
+        return result.scalar()
+
+    return await count_cache.get("users", count)
+
 
+async def get_user_list(
+    *, session: AsyncSession, skip: int = 0, limit: int = 100, after: tuple[int, int] | None = None
+) -> list[User]:
+    """获取用户列表，按 (created_at, id) 排序
 
-async def get_user_list(*, session: AsyncSession, skip: int = 0, limit: int = 100) -> list[User]:
-    async with session.begin():
-        result = await session.execute(select(User).offset(skip).limit(limit))
+    - after: 键集分页的起点 (created_at, id)，传入时忽略 skip
+    """
+    stmt = select(User).order_by(User.created_at, User.id).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after))
+    else:
+        stmt = stmt.offset(skip)
+    result = await session.execute(stmt)
     return result.scalars().all()
 
 
 async def authenticate_user(*, session: AsyncSession, username_or_email: str, password: str) -> User | None:
     user = await get_user_by_username_or_email(session=session, username_or_email=username_or_email)
-    if user and verify_password(password, user.hashed_password):
+    if user and await async_verify_password(password, user.hashed_password):
         return user
     return None
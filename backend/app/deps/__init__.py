@@ -1,5 +1,21 @@
-from app.deps.database import session_dep
-from app.deps.tokens import token_dep
-from app.deps.users import current_active_user_dep, current_user_dep
+from app.deps.database import read_session_dep, session_dep
+from app.deps.loaders import user_loader_dep
+from app.deps.tokens import optional_token_dep, token_dep
+from app.deps.users import (
+    current_active_user_dep,
+    current_admin_dep,
+    current_super_admin_dep,
+    current_user_dep,
+)
 
-__all__ = [token_dep, session_dep, current_user_dep, current_active_user_dep]
+__all__ = [
+    token_dep,
+    optional_token_dep,
+    session_dep,
+    read_session_dep,
+    current_user_dep,
+    current_active_user_dep,
+    current_admin_dep,
+    current_super_admin_dep,
+    user_loader_dep,
+]
@@ -4,13 +4,22 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import async_session
+from app.core.database import read_session, unit_of_work
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """异步数据库会话生成器"""
-    async with async_session() as session:
+    """请求级工作单元：整个请求共用一个会话，请求结束时提交，出错时回滚"""
+    async with unit_of_work() as session:
         yield session
 
 
 session_dep = Annotated[AsyncSession, Depends(get_session)]
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """只读会话：GET 路由使用读引擎，不占用写连接，无需提交"""
+    async with read_session() as session:
+        yield session
+
+
+read_session_dep = Annotated[AsyncSession, Depends(get_read_session)]
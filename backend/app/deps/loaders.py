@@ -0,0 +1,20 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from app import crud
+from app.core.loader import DataLoader
+from app.deps.database import read_session_dep
+from app.models import User
+
+
+async def get_user_loader(session: read_session_dep) -> DataLoader[int, User]:
+    """请求内共享的用户加载器（同一请求中的依赖只创建一次）"""
+
+    async def batch_load(ids: list[int]) -> dict[int, User]:
+        return {user.id: user for user in await crud.get_users_by_ids(session=session, ids=ids)}
+
+    return DataLoader(batch_load)
+
+
+user_loader_dep = Annotated[DataLoader[int, User], Depends(get_user_loader)]
@@ -8,3 +8,8 @@ from app import settings
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_STR}/tokens")
 
 token_dep = Annotated[str, Depends(oauth2_scheme)]
+
+# 可选的访问令牌（如退出登录时只持有刷新令牌 Cookie）
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_STR}/tokens", auto_error=False)
+
+optional_token_dep = Annotated[str | None, Depends(optional_oauth2_scheme)]
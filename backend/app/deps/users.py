@@ -1,33 +1,70 @@
+import time
 from typing import Annotated
 
 from fastapi import Depends
 
 from app.core import exceptions
+from app.core.cache import token_cache, user_cache
+from app.core.revocations import revocations
 from app.core.security import verify_token
 from app.crud import get_user
 from app.deps import session_dep, token_dep
-from app.models import User
-from app.schemas import TokenData
+from app.schemas import CurrentUser, TokenData
 
 
-async def get_current_user(*, session: session_dep, token: token_dep) -> User:
-    token_data: TokenData = verify_token(token)
+async def get_current_user(*, session: session_dep, token: token_dep) -> CurrentUser:
+    """获取当前用户
+
+    令牌解码结果与用户快照均有进程内缓存，命中时不查询数据库；吊销检查在内存中完成。
+    """
+    token_data: TokenData | None = token_cache.get(token)
     if token_data is None:
+        token_data = verify_token(token)
+        if token_data is None:
+            raise exceptions.INVALID_CREDENTIALS
+        # 缓存时间不超过令牌剩余有效期
+        ttl = None if token_data.exp is None else token_data.exp - time.time()
+        token_cache.set(token, token_data, ttl=ttl)
+    if revocations.is_revoked(token_data.jti):
+        token_cache.pop(token)
         raise exceptions.INVALID_CREDENTIALS
 
-    current_user = await get_user(session=session, id=token_data.id)
+    current_user: CurrentUser | None = user_cache.get(token_data.id)
     if current_user is None:
-        raise exceptions.INVALID_CREDENTIALS
+        user = await get_user(session=session, id=token_data.id)
+        if user is None:
+            raise exceptions.INVALID_CREDENTIALS
+        current_user = CurrentUser.model_validate(user)
+        user_cache.set(current_user.id, current_user)
 
     return current_user
 
 
-current_user_dep = Annotated[User, Depends(get_current_user)]
+current_user_dep = Annotated[CurrentUser, Depends(get_current_user)]
 
 
 async def get_current_active_user(current_user: current_user_dep):
     if current_user.power < 1:  # BANED 用户
         raise exceptions.PERMISSION_DENIED
+    return current_user
+
+
+current_active_user_dep = Annotated[CurrentUser, Depends(get_current_active_user)]
+
+
+async def get_current_admin(current_user: current_user_dep):
+    if current_user.power < 2:  # 非管理员
+        raise exceptions.PERMISSION_DENIED
+    return current_user
+
+
+current_admin_dep = Annotated[CurrentUser, Depends(get_current_admin)]
+
+
+async def get_current_super_admin(current_user: current_user_dep):
+    if current_user.power < 3:  # 非超级管理员
+        raise exceptions.PERMISSION_DENIED
+    return current_user
 
 
-current_active_user_dep = Annotated[User, Depends(get_current_active_user)]
+current_super_admin_dep = Annotated[CurrentUser, Depends(get_current_super_admin)]
@@ -1,12 +1,24 @@
-from fastapi import FastAPI
+import hmac
+
+from fastapi import FastAPI, Request
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
 from app import settings
 from app.api.routes import router as api_router
+from app.core import exceptions
+from app.core.cache import token_cache, user_cache
+from app.core.exports import export_limiter
+from app.core.http_cache import response_cache
+from app.core.images import image_cache, image_executor
 from app.core.lifecycle import lifespan
+from app.core.metrics import MetricsMiddleware, register_stats, registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.revocations import revocations
+from app.core.security import password_hasher
+from app.core.static import MediaAwareGZipMiddleware, PrecompressedStaticFiles
 
 
 def create_app() -> FastAPI:
@@ -14,11 +26,18 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         openapi_url=f"{settings.API_STR}/openapi.json",
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
         debug=settings.DEBUG,
         middleware=[
+            # 最外层，记录的响应大小为压缩后的大小
+            *([Middleware(MetricsMiddleware)] if settings.METRICS_ENABLED else []),
+            # 超级管理员请求头或限时开关开启时采样
+            Middleware(ProfilingMiddleware),
+            # 只压缩文本类的动态响应，静态文件使用预压缩版本
             Middleware(
-                GZipMiddleware,
+                MediaAwareGZipMiddleware,
                 minimum_size=1024,  # 1KB
+                compresslevel=6,
             ),
         ],
     )
@@ -43,8 +62,37 @@ def create_app() -> FastAPI:
             "docs": app.docs_url,
         }
 
+    if settings.METRICS_ENABLED:
+        for component, stats in {
+            "password_hasher": password_hasher.stats,
+            "image_executor": image_executor.stats,
+            "image_cache": image_cache.stats,
+            "token_cache": token_cache.stats,
+            "token_revocations": revocations.stats,
+            "user_cache": user_cache.stats,
+            "response_cache": response_cache.stats,
+            "exports": export_limiter.stats,
+        }.items():
+            register_stats(component, stats)
+
+        @app.get("/metrics", tags=["root"], response_class=PlainTextResponse)
+        async def read_metrics(request: Request) -> PlainTextResponse:
+            """性能指标（Prometheus 文本格式）
+
+            数值只来自处理本次请求的工作进程（`app_process_info` 的 pid 标签标识进程），多进程部署时
+            由 Prometheus 分别抓取各进程或按 pid 汇总。来自 METRICS_ALLOW_HOSTS 的请求直接放行，
+            其他请求需要 `Authorization: Bearer <METRICS_TOKEN>` 认证；两者都未设置时拒绝所有访问。
+            """
+            if request.client is None or request.client.host not in settings.METRICS_ALLOW_HOSTS:
+                if not settings.METRICS_TOKEN:
+                    raise exceptions.PERMISSION_DENIED
+                authorization = request.headers.get("authorization", "")
+                if not hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+                    raise exceptions.INVALID_CREDENTIALS
+            return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
     app.include_router(api_router, prefix=settings.API_STR)
-    app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory=settings.STATIC_DIR), name="static")
 
     return app
 
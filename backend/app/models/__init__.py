@@ -1,8 +1,23 @@
 from app.models.base import ModelBase
 from app.models.categories import Category
+from app.models.imports import ImportCheckpoint
+from app.models.migrations import SchemaMigration
 from app.models.posts import Post
+from app.models.posts_fts import posts_fts
 from app.models.posts_tags import posts_tags
 from app.models.tags import Tag
+from app.models.tokens import TokenRevocation
 from app.models.users import User
 
-__all__ = [ModelBase, User, Post, Tag, Category, posts_tags]
+__all__ = [
+    ModelBase,
+    User,
+    Post,
+    Tag,
+    Category,
+    posts_tags,
+    posts_fts,
+    ImportCheckpoint,
+    SchemaMigration,
+    TokenRevocation,
+]
@@ -0,0 +1,14 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ModelBase
+from app.models.mixins import TimestampMixin
+
+
+class ImportCheckpoint(ModelBase, TimestampMixin):
+    """批量导入进度（与每批数据在同一事务中提交，用于失败后续传）"""
+
+    __tablename__ = "import_checkpoints"
+
+    source: Mapped[str] = mapped_column(String(255), primary_key=True)  # `{类型}:{文件绝对路径}`
+    position: Mapped[int] = mapped_column(default=0)  # 已导入的记录数
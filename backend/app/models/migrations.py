@@ -0,0 +1,14 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ModelBase
+from app.models.mixins import TimestampMixin
+
+
+class SchemaMigration(ModelBase, TimestampMixin):
+    """已执行的数据库迁移（见 app.core.migrations）"""
+
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(64))
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import ModelBase
@@ -7,12 +7,22 @@ from app.models.mixins import TimestampMixin
 
 class Post(ModelBase, TimestampMixin):
     __tablename__ = "posts"
+    __table_args__ = (
+        # 列表按 (created_at, id) 倒序键集分页；按作者、分类筛选时同一个索引既过滤又提供排序
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_posts_category_id_created_at_id", "category_id", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(64), unique=True)
     content: Mapped[str] = mapped_column(Text)
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"))
+    category_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"), nullable=True)
 
     author = relationship("User", back_populates="posts")
     category = relationship("Category", back_populates="posts")
     tags = relationship("Tag", secondary="posts_tags", back_populates="posts")
+
+    @property
+    def tag_ids(self) -> list[int]:
+        return [tag.id for tag in self.tags]
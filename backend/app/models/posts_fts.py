@@ -0,0 +1,47 @@
+from sqlalchemy import DDL, column, event, table
+
+from app import settings
+from app.models.posts import Post
+
+# 文章全文索引（SQLite FTS5 外部内容表，内容保存在 posts 表中，由触发器同步）
+posts_fts = table("posts_fts", column("rowid"), column("rank"))
+
+POSTS_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id', tokenize='{settings.POST_FTS_TOKENIZER}'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+# 新数据库创建 posts 表后创建全文索引和同步触发器，删除 posts 表前删除全文索引（仅 SQLite）；
+# 已有数据库由迁移 create_posts_search 创建并重建索引（见 app.core.migrations）
+for ddl in POSTS_FTS_DDL:
+    event.listen(Post.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite"))
+event.listen(Post.__table__, "before_drop", DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"))
+
+# PostgreSQL 没有 FTS5，搜索退化为 ILIKE 子串匹配，由 pg_trgm 三元组索引加速（与 trigram 分词器语义一致）
+POSTS_TRGM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_posts_title_trgm ON posts USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_posts_content_trgm ON posts USING gin (content gin_trgm_ops)",
+]
+for ddl in POSTS_TRGM_DDL:
+    event.listen(Post.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql"))
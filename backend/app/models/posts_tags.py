@@ -1,10 +1,12 @@
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, Table
 
 from app.models.base import ModelBase
 
+# 主键 (post_id, tag_id) 用于加载文章的标签，索引 (tag_id, post_id) 用于按标签筛选文章
 posts_tags = Table(
     "posts_tags",
     ModelBase.metadata,
-    Column("post_id", Integer, ForeignKey("posts.id")),
-    Column("tag_id", Integer, ForeignKey("tags.id")),
+    Column("post_id", Integer, ForeignKey("posts.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Index("ix_posts_tags_tag_id_post_id", "tag_id", "post_id"),
 )
@@ -0,0 +1,16 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import ModelBase
+from app.models.mixins import TimestampMixin
+
+
+class TokenRevocation(ModelBase, TimestampMixin):
+    """已吊销的令牌（过期后可删除），各工作进程按自增 ID 增量同步到内存"""
+
+    __tablename__ = "token_revocations"
+    __table_args__ = {"sqlite_autoincrement": True}  # 删除记录后 ID 也不复用，保证同步游标只增不减
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[str] = mapped_column(String(32), unique=True)
+    expires_at: Mapped[int]  # 令牌原本的过期时间
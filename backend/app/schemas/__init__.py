@@ -1,9 +1,18 @@
 from app.schemas.categories import CategoryCreate, CategoryResp, CategoryUpdate
-from app.schemas.pages import PaginatedResponse
-from app.schemas.posts import PostCreate, PostResp, PostUpdate
+from app.schemas.pages import PageMeta, PaginatedResponse
+from app.schemas.posts import PostCreate, PostResp, PostSearchResp, PostUpdate
+from app.schemas.profiles import ProfileStatus, ProfileToggle
 from app.schemas.tags import TagCreate, TagResp, TagUpdate
 from app.schemas.tokens import AccessToken, TokenData
-from app.schemas.users import UserCreate, UserEmailLogin, UserNameLogin, UserResp, UserUpdate
+from app.schemas.users import (
+    AvatarTaskResp,
+    CurrentUser,
+    UserCreate,
+    UserEmailLogin,
+    UserNameLogin,
+    UserResp,
+    UserUpdate,
+)
 
 __all__ = [
     UserCreate,
@@ -11,9 +20,12 @@ __all__ = [
     UserEmailLogin,
     UserNameLogin,
     UserResp,
+    CurrentUser,
+    AvatarTaskResp,
     PostCreate,
     PostUpdate,
     PostResp,
+    PostSearchResp,
     CategoryCreate,
     CategoryUpdate,
     CategoryResp,
@@ -22,5 +34,8 @@ __all__ = [
     TagResp,
     AccessToken,
     TokenData,
+    PageMeta,
     PaginatedResponse,
+    ProfileToggle,
+    ProfileStatus,
 ]
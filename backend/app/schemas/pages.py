@@ -5,10 +5,35 @@ from pydantic import BaseModel, ConfigDict
 T = TypeVar("T")
 
 
+class PageMeta(BaseModel):
+    """分页信息
+
+    - 页码模式: 返回 `page`、`total_pages`
+    - 游标模式: 传入上一页的 `next_cursor`，`page`、`total_pages` 为空
+    """
+
+    total: int | None = None
+    page: int | None = None
+    per_page: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     data: list[T]
-    meta: dict
+    meta: PageMeta
 
     model_config = ConfigDict(
-        json_schema_extra={"example": {"data": [], "meta": {"total": 100, "page": 1, "per_page": 20, "total_pages": 5}}}
+        json_schema_extra={
+            "example": {
+                "data": [],
+                "meta": {
+                    "total": 100,
+                    "page": 1,
+                    "per_page": 20,
+                    "total_pages": 5,
+                    "next_cursor": "WzE3NDAwMDAwMDAsMjBd",
+                },
+            }
+        }
     )
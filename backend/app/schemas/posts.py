@@ -15,6 +15,25 @@ class PostUpdate(BaseModel):
     tag_ids: list[int] | None = None
 
 
+class PostAuthor(BaseModel):
+    id: int
+    username: str
+    avatar: str | None = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostCategory(BaseModel):
+    id: int
+    name: str
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostTag(BaseModel):
+    id: int
+    name: str
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PostResp(BaseModel):
     id: int
     title: str
@@ -24,4 +43,12 @@ class PostResp(BaseModel):
     tag_ids: list[int] | None = None
     created_at: int
     updated_at: int
+    author: PostAuthor | None = None
+    category: PostCategory | None = None
+    tags: list[PostTag] = []
     model_config = ConfigDict(from_attributes=True)
+
+
+class PostSearchResp(PostResp):
+    rank: float
+    snippet: str
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+from app import settings
+
+
+class ProfileToggle(BaseModel):
+    seconds: int = Field(gt=0, le=settings.PROFILE_MAX_SECONDS, description="开启时长（秒）")
+    path_prefix: str = Field("", description="只分析路径以此开头的请求，默认全部")
+
+
+class ProfileStatus(BaseModel):
+    active: bool
+    enabled_until: float | None = None
+    path_prefix: str
+    profiles: list[str]
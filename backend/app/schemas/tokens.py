@@ -9,3 +9,5 @@ class AccessToken(BaseModel):
 class TokenData(BaseModel):
     id: int
     power: int
+    exp: int | None = None
+    jti: str | None = None  # 令牌唯一 ID（用于吊销）
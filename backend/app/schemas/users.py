@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -32,3 +34,16 @@ class UserResp(BaseModel):
     created_at: int
     updated_at: int
     model_config = ConfigDict(from_attributes=True)
+
+
+class CurrentUser(UserResp):
+    """当前用户快照（缓存共享，不可变）"""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class AvatarTaskResp(BaseModel):
+    """头像处理任务状态"""
+
+    status: Literal["pending", "done", "failed"]
+    avatar: str | None = None
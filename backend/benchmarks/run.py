@@ -0,0 +1,248 @@
+"""API 热点路径基准测试
+
+在进程内（ASGITransport）启动应用，通过生命周期函数生成测试数据，以固定并发驱动各场景，
+输出 p50/p95/p99 延迟与吞吐量，并与保存的基线比较，性能回退时以非零状态退出。
+
+用法（在 backend 目录下）:
+
+    python -m benchmarks.run                      # 运行并与基线比较
+    python -m benchmarks.run --update-baseline    # 运行并更新基线
+    python -m benchmarks.run --scenario me --scenario list_posts --concurrency 32
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, Response
+from PIL import Image
+
+from app import settings
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Context:
+    client: AsyncClient
+    users: list[dict]  # 每个并发工作者独占一个已登录用户：{"id", "username", "headers", "refresh_token"}
+    usernames: list[str]
+    user_pages: int  # 每页 20 条时的总页数
+    post_pages: int
+    avatar: bytes
+    rng: random.Random  # 固定种子，各次运行请求的页码序列相同
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+Scenario = Callable[[Context, int, int], Awaitable[Response]]
+
+
+async def login(ctx: Context, _worker: int, i: int) -> Response:
+    username = ctx.usernames[i % len(ctx.usernames)]
+    return await ctx.client.post("/api/tokens", data={"username": username, "password": "123456"})
+
+
+async def refresh(ctx: Context, worker: int, _i: int) -> Response:
+    return await ctx.client.put(
+        "/api/tokens", headers={"Cookie": f"refresh_token={ctx.users[worker]['refresh_token']}"}
+    )
+
+
+async def me(ctx: Context, worker: int, _i: int) -> Response:
+    return await ctx.client.get("/api/users/me", headers=ctx.users[worker]["headers"])
+
+
+# 列表场景测量查询与序列化：随机页码，并以唯一的查询参数（路由忽略，但属于缓存键）绕过响应缓存，
+# 否则循环请求少量页面时测到的几乎都是缓存命中
+async def list_users(ctx: Context, _worker: int, i: int) -> Response:
+    page = ctx.rng.randrange(ctx.user_pages) + 1
+    return await ctx.client.get("/api/users", params={"page": page, "per_page": 20, "bench": i})
+
+
+async def list_posts(ctx: Context, _worker: int, i: int) -> Response:
+    page = ctx.rng.randrange(ctx.post_pages) + 1
+    return await ctx.client.get("/api/posts", params={"page": page, "per_page": 20, "bench": i})
+
+
+async def avatar_upload(ctx: Context, worker: int, _i: int) -> Response:
+    """上传头像并轮询至处理完成（测量完整的处理耗时）"""
+    user = ctx.users[worker]
+    url = f"/api/users/{user['id']}/avatar"
+    response = await ctx.client.patch(
+        url, files={"avatar": ("avatar.jpg", ctx.avatar, "image/jpeg")}, headers=user["headers"]
+    )
+    while response.status_code < 400 and response.json()["status"] == "pending":
+        await asyncio.sleep(0.01)
+        response = await ctx.client.get(url, headers=user["headers"])
+    return response
+
+
+# 场景 -> (请求函数, 默认请求数)
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    "login": (login, 50),
+    "refresh": (refresh, 1000),
+    "me": (me, 2000),
+    "list_users": (list_users, 1000),
+    "list_posts": (list_posts, 1000),
+    "avatar_upload": (avatar_upload, 100),
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(ctx: Context, scenario: Scenario, *, requests: int, concurrency: int) -> Result:
+    """以固定并发执行 requests 次请求"""
+    counter = itertools.count()
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+
+    async def worker(worker_id: int) -> None:
+        while (i := next(counter)) < requests:
+            start = time.perf_counter()
+            response = await scenario(ctx, worker_id, i)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return Result(
+        requests=requests,
+        errors=sum(count for status, count in statuses.items() if status >= 400),
+        rps=round(requests / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+    )
+
+
+async def prepare(client: AsyncClient, *, users: int, posts: int, concurrency: int) -> Context:
+    from app.core.lifecycle import create_seed_data
+
+    usernames = await create_seed_data(users=max(users, concurrency), posts=posts)
+    logged_in = []
+    for username in usernames[:concurrency]:
+        response = await client.post("/api/tokens", data={"username": username, "password": "123456"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        user = (await client.get("/api/users/me", headers=headers)).json()
+        logged_in.append(
+            {
+                "id": user["id"],
+                "username": username,
+                "headers": headers,
+                "refresh_token": response.cookies["refresh_token"],
+            }
+        )
+
+    image = io.BytesIO()
+    Image.new("RGB", (800, 600), color=(40, 120, 200)).save(image, format="JPEG")
+    return Context(
+        client=client,
+        users=logged_in,
+        usernames=usernames,
+        user_pages=max(1, len(usernames) // 20),
+        post_pages=max(1, posts // 20),
+        avatar=image.getvalue(),
+        rng=random.Random(0),
+    )
+
+
+def compare(results: dict[str, Result], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """与基线比较，返回回退项：p95 延迟变慢或吞吐量下降超过 tolerance，或出现错误响应"""
+    failures = []
+    for name, result in results.items():
+        if result.errors:
+            failures.append(f"{name}: {result.errors} 个错误响应")
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result.p95_ms > expected["p95_ms"] * (1 + tolerance):
+            failures.append(f"{name}: p95 {result.p95_ms}ms > 基线 {expected['p95_ms']}ms")
+        if result.rps < expected["rps"] * (1 - tolerance):
+            failures.append(f"{name}: 吞吐量 {result.rps}/s < 基线 {expected['rps']}/s")
+    return failures
+
+
+def print_report(results: dict[str, Result], baseline: dict[str, dict]) -> None:
+    print(
+        f"{'场景':<16}{'请求数':>8}{'错误':>6}{'rps':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'基线p95':>10}"
+    )
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get("p95_ms", "-")
+        print(
+            f"{name:<16}{result.requests:>8}{result.errors:>6}{result.rps:>10}"
+            f"{result.p50_ms:>10}{result.p95_ms:>10}{result.p99_ms:>10}{expected:>10}"
+        )
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.core.lifecycle import lifespan
+    from app.main import app
+
+    # 测试数据写入 DATABASE_URL 指向的数据库，只允许在启动时重建、退出时删除数据库的环境中运行
+    if settings.APP_ENV == "production" or not settings.DB_RESET_ON_START:
+        print("基准测试会写入大量测试数据，只能在 DB_RESET_ON_START=true 的非生产环境运行")
+        return 2
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results: dict[str, Result] = {}
+    async with lifespan(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            ctx = await prepare(client, users=args.users, posts=args.posts, concurrency=args.concurrency)
+            for name in args.scenario or SCENARIOS:
+                scenario, default_requests = SCENARIOS[name]
+                results[name] = await run_scenario(
+                    ctx, scenario, requests=args.requests or default_requests, concurrency=args.concurrency
+                )
+
+    print_report(results, baseline)
+    if args.update_baseline:
+        baseline.update({name: asdict(result) for name, result in results.items()})
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+        print(f"基线已更新: {BASELINE_PATH}")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"性能回退 {failure}")
+    return 1 if failures else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="FastCMS API 基准测试")
+    parser.add_argument("--users", type=int, default=200, help="生成的用户数")
+    parser.add_argument("--posts", type=int, default=2000, help="生成的文章数")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发数")
+    parser.add_argument("--requests", type=int, default=None, help="每个场景的请求数（默认按场景设定）")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="只运行指定场景（可重复）")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的性能波动比例")
+    parser.add_argument("--update-baseline", action="store_true", help="将本次结果保存为基线")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,41 @@
+"""批量导入用户/文章（JSONL 或 CSV）
+
+用法:
+
+    python import_data.py users users.jsonl
+    python import_data.py posts posts.csv --batch-size 2000
+    python import_data.py posts posts.jsonl --restart  # 忽略已保存的进度，从头导入
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from loguru import logger
+
+from app.core.bus import bus
+from app.core.importer import import_posts, import_users
+
+
+async def main(args: argparse.Namespace) -> None:
+    importer = import_users if args.kind == "users" else import_posts
+    # 通知运行中的各工作进程刷新缓存
+    await bus.start()
+    try:
+        stats = await importer(args.path, fmt=args.format, batch_size=args.batch_size, restart=args.restart)
+    finally:
+        await bus.stop()
+    logger.info(
+        f"导入完成 {stats.source}: {stats.rows} 条记录（跳过已导入 {stats.skipped} 条）, "
+        f"耗时 {stats.seconds:.1f} 秒, {stats.rows_per_sec:.0f} 行/秒"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FastCMS 批量导入")
+    parser.add_argument("kind", choices=["users", "posts"], help="导入类型")
+    parser.add_argument("path", type=Path, help="JSONL 或 CSV 文件")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="文件格式（默认按扩展名判断）")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每个事务写入的记录数")
+    parser.add_argument("--restart", action="store_true", help="忽略已保存的进度，从头导入")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+import csv
+import io
+
+import pytest
+import ujson
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.exports import export_limiter, stream_export
+from app.models import User
+
+
+@pytest.mark.anyio
+async def test_export_users(
+    client: AsyncClient, test_admin_token_headers: dict[str, str], test_user_token_headers: dict[str, str]
+):
+    """测试以 NDJSON 流式导出用户"""
+    response = await client.get("/api/exports/users", headers=test_user_token_headers)
+    assert response.status_code == 403
+
+    response = await client.get("/api/exports/users", headers=test_admin_token_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    users = [ujson.loads(line) for line in response.text.splitlines()]
+    assert "test_admin" in {user["username"] for user in users}
+    assert all("hashed_password" not in user for user in users)
+
+
+@pytest.mark.anyio
+async def test_export_posts_csv(client: AsyncClient, test_admin_token_headers: dict[str, str]):
+    """测试以 CSV 流式导出文章（字段与批量导入一致）"""
+    await client.post(
+        "/api/posts", json={"title": "export_post", "content": "export"}, headers=test_admin_token_headers
+    )
+    response = await client.get("/api/exports/posts", params={"format": "csv"}, headers=test_admin_token_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    post = next(row for row in rows if row["title"] == "export_post")
+    assert post["author"] == "test_admin"
+    assert {"id", "content", "category", "tags", "created_at"} <= post.keys()
+
+
+@pytest.mark.anyio
+async def test_export_limit(client: AsyncClient, test_admin_token_headers: dict[str, str]):
+    """测试导出流打开期间读请求不受影响，导出名额满时返回 503"""
+    stream = stream_export(select(User.id).order_by(User.id), "ndjson", chunk_rows=1)
+    await anext(stream)  # 导出流已打开并持有读连接
+    for _ in range(export_limiter.limit):
+        export_limiter.acquire()
+    try:
+        response = await client.get("/api/posts")
+        assert response.status_code == 200
+
+        response = await client.get("/api/exports/users", headers=test_admin_token_headers)
+        assert response.status_code == 503
+    finally:
+        for _ in range(export_limiter.limit):
+            export_limiter.release()
+        await stream.aclose()
+
+    response = await client.get("/api/exports/users", headers=test_admin_token_headers)
+    assert response.status_code == 200
+    assert export_limiter.active == 0
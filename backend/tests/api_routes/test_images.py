@@ -0,0 +1,73 @@
+import asyncio
+import io
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+from app.core.images import image_cache, supported_formats
+
+
+@pytest.mark.anyio
+async def test_read_avatar_image(client: AsyncClient, test_admin_token_headers: dict[str, str], monkeypatch):
+    """测试获取指定尺寸的头像"""
+    user = (await client.get("/api/users/me", headers=test_admin_token_headers)).json()
+    image = io.BytesIO()
+    Image.new("RGB", (800, 400), color=(200, 80, 40)).save(image, format="JPEG")
+    response = await client.patch(
+        f"/api/users/{user['id']}/avatar",
+        files={"avatar": ("avatar.jpg", image.getvalue(), "image/jpeg")},
+        headers=test_admin_token_headers,
+    )
+    filename = response.json()["avatar"]
+    for _ in range(100):
+        response = await client.get(f"/api/users/{user['id']}/avatar", headers=test_admin_token_headers)
+        if response.json()["status"] != "pending":
+            break
+        await asyncio.sleep(0.1)
+    assert response.json()["status"] == "done"
+
+    url = f"/api/images/avatars/{user['id']}/{filename}"
+    response = await client.get(url, params={"w": 64, "fmt": "webp"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert "immutable" in response.headers["cache-control"]
+    with Image.open(io.BytesIO(response.content)) as img:
+        assert img.size == (64, 32)
+
+    # 再次请求命中磁盘缓存
+    hits = image_cache.hits
+    response = await client.get(url, params={"w": 64, "fmt": "webp"})
+    assert response.status_code == 200
+    assert image_cache.hits == hits + 1
+
+    # 不支持的尺寸
+    response = await client.get(url, params={"w": 65})
+    assert response.status_code == 400
+
+    response = await client.get(url, params={"w": 64, "fmt": "avif"})
+    assert response.status_code == (200 if "avif" in supported_formats() else 400)
+
+    response = await client.get(f"/api/images/avatars/{user['id']}/{user['id']}_{'0' * 32}.webp", params={"w": 64})
+    assert response.status_code == 404
+
+    # 单个文件超过缓存上限时不被自身的写入淘汰
+    monkeypatch.setattr(image_cache, "max_bytes", 1)
+    response = await client.get(url, params={"w": 128, "fmt": "webp"})
+    assert response.status_code == 200
+    with Image.open(io.BytesIO(response.content)) as img:
+        assert img.size == (128, 64)
+    assert await image_cache.get(f"{filename.removesuffix('.webp')}_w128.webp") is not None
+
+    # 命中缓存后文件被其他写入淘汰时重新生成
+    path = image_cache._path(f"{filename.removesuffix('.webp')}_w64.webp")
+
+    async def get_evicted(_key):
+        return path
+
+    path.unlink(missing_ok=True)
+    monkeypatch.setattr(image_cache, "get", get_evicted)
+    response = await client.get(url, params={"w": 64, "fmt": "webp"})
+    assert response.status_code == 200
+    with Image.open(io.BytesIO(response.content)) as img:
+        assert img.size == (64, 32)
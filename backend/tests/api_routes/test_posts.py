@@ -0,0 +1,171 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.fixture(scope="module")
+async def taxonomy() -> dict[str, list[int]]:
+    """创建测试用的分类和标签"""
+    from app.core.database import async_session
+    from app.models import Category, Tag
+
+    async with async_session() as session:
+        async with session.begin():
+            categories = [Category(name=f"分类{i}") for i in range(2)]
+            tags = [Tag(name=f"标签{i}") for i in range(3)]
+            session.add_all(categories + tags)
+        return {"category_ids": [c.id for c in categories], "tag_ids": [t.id for t in tags]}
+
+
+@pytest.mark.anyio
+async def test_post_crud(
+    client: AsyncClient,
+    taxonomy: dict[str, list[int]],
+    test_user_token_headers: dict[str, str],
+    test_admin_token_headers: dict[str, str],
+):
+    """测试文章增删改查"""
+    category_id = taxonomy["category_ids"][0]
+    tag_ids = taxonomy["tag_ids"]
+
+    # 未登录不能创建
+    response = await client.post("/api/posts", json={"title": "t", "content": "c"})
+    assert response.status_code == 401
+
+    response = await client.post(
+        "/api/posts",
+        json={"title": "第一篇文章", "content": "内容", "category_id": category_id, "tag_ids": tag_ids[:2]},
+        headers=test_user_token_headers,
+    )
+    assert response.status_code == 200
+    post = response.json()
+    assert post["author"]["username"] == "test_user_0"
+    assert post["category"]["id"] == category_id
+    assert sorted(post["tag_ids"]) == sorted(tag_ids[:2])
+
+    # 标题重复、标签不存在
+    response = await client.post(
+        "/api/posts", json={"title": "第一篇文章", "content": "内容"}, headers=test_user_token_headers
+    )
+    assert response.status_code == 409
+    response = await client.post(
+        "/api/posts",
+        json={"title": "第二篇文章", "content": "内容", "tag_ids": [9999]},
+        headers=test_user_token_headers,
+    )
+    assert response.status_code == 404
+
+    # 标签差量更新
+    response = await client.patch(
+        f"/api/posts/{post['id']}", json={"tag_ids": tag_ids[1:]}, headers=test_user_token_headers
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()["tag_ids"]) == sorted(tag_ids[1:])
+    assert response.json()["title"] == "第一篇文章"
+
+    response = await client.get(f"/api/posts/{post['id']}")
+    assert response.status_code == 200
+    assert sorted(tag["id"] for tag in response.json()["tags"]) == sorted(tag_ids[1:])
+
+    # 管理员可以修改普通用户的文章，普通用户不能修改管理员的文章
+    response = await client.patch(
+        f"/api/posts/{post['id']}", json={"content": "管理员修改"}, headers=test_admin_token_headers
+    )
+    assert response.status_code == 200
+    response = await client.post(
+        "/api/posts", json={"title": "管理员的文章", "content": "内容"}, headers=test_admin_token_headers
+    )
+    admin_post = response.json()
+    response = await client.delete(f"/api/posts/{admin_post['id']}", headers=test_user_token_headers)
+    assert response.status_code == 403
+
+    response = await client.delete(f"/api/posts/{post['id']}", headers=test_user_token_headers)
+    assert response.status_code == 204
+    response = await client.get(f"/api/posts/{post['id']}")
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_read_post_list(
+    client: AsyncClient, taxonomy: dict[str, list[int]], test_user_token_headers: dict[str, str]
+):
+    """测试文章列表（筛选、游标分页）"""
+    tag_id = taxonomy["tag_ids"][2]
+    for i in range(5):
+        response = await client.post(
+            "/api/posts",
+            json={"title": f"列表文章{i}", "content": "内容", "tag_ids": [tag_id] if i % 2 == 0 else []},
+            headers=test_user_token_headers,
+        )
+        assert response.status_code == 200
+
+    response = await client.get("/api/posts", params={"tag_id": tag_id})
+    body = response.json()
+    assert body["meta"]["total"] == 3
+    assert all(tag_id in post["tag_ids"] for post in body["data"])
+
+    response = await client.get("/api/posts", params={"per_page": 100})
+    all_ids = [post["id"] for post in response.json()["data"]]
+    assert response.json()["meta"]["total"] == len(all_ids)
+
+    ids = []
+    params = {"per_page": 2, "with_total": False}
+    while True:
+        body = (await client.get("/api/posts", params=params)).json()
+        ids.extend(post["id"] for post in body["data"])
+        if body["meta"]["next_cursor"] is None:
+            break
+        params["cursor"] = body["meta"]["next_cursor"]
+    assert ids == all_ids
+
+
+@pytest.mark.anyio
+async def test_search_posts(
+    client: AsyncClient, taxonomy: dict[str, list[int]], test_user_token_headers: dict[str, str]
+):
+    """测试文章全文搜索"""
+    category_id = taxonomy["category_ids"][1]
+    posts = [
+        ("FastAPI 入门", "使用 FastAPI 构建高性能接口，FastAPI 基于 Starlette。", category_id),
+        ("SQLite 全文检索", "FTS5 为 SQLite 提供全文检索，也可以用于 FastAPI 项目。", None),
+        ("无关文章", "今天天气不错。", None),
+    ]
+    ids = []
+    for title, content, cid in posts:
+        response = await client.post(
+            "/api/posts",
+            json={"title": title, "content": content, "category_id": cid},
+            headers=test_user_token_headers,
+        )
+        ids.append(response.json()["id"])
+
+    response = await client.get("/api/posts/search", params={"q": "fastapi"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [post["id"] for post in body["data"]] == ids[:2]  # 出现次数多的排在前面
+    assert "<mark>" in body["data"][0]["snippet"]
+
+    # 多个词之间为 AND，中文子串匹配
+    response = await client.get("/api/posts/search", params={"q": "全文检索 fastapi"})
+    assert [post["id"] for post in response.json()["data"]] == [ids[1]]
+
+    response = await client.get("/api/posts/search", params={"q": "fastapi", "category_id": category_id})
+    assert [post["id"] for post in response.json()["data"]] == [ids[0]]
+
+    # 游标分页
+    response = await client.get("/api/posts/search", params={"q": "fastapi", "per_page": 1})
+    body = response.json()
+    assert [post["id"] for post in body["data"]] == [ids[0]]
+    response = await client.get(
+        "/api/posts/search", params={"q": "fastapi", "per_page": 1, "cursor": body["meta"]["next_cursor"]}
+    )
+    assert [post["id"] for post in response.json()["data"]] == [ids[1]]
+
+    # 更新、删除后索引同步
+    await client.patch(f"/api/posts/{ids[2]}", json={"content": "也在用 FastAPI"}, headers=test_user_token_headers)
+    await client.delete(f"/api/posts/{ids[0]}", headers=test_user_token_headers)
+    response = await client.get("/api/posts/search", params={"q": "fastapi"})
+    assert sorted(post["id"] for post in response.json()["data"]) == sorted(ids[1:])
+
+    # 特殊字符不会导致 FTS5 语法错误
+    response = await client.get("/api/posts/search", params={"q": 'fast" OR (api'})
+    assert response.status_code == 200
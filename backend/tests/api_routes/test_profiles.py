@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.anyio
+async def test_profile_by_header(
+    client: AsyncClient, test_super_admin_token_headers: dict[str, str], test_admin_token_headers: dict[str, str]
+):
+    """测试超级管理员通过请求头分析单个请求，并下载折叠栈文件"""
+    response = await client.get("/api/users/me", headers={**test_admin_token_headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+    response = await client.get("/api/users/me", headers={**test_super_admin_token_headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    name = response.headers["x-profile-id"]
+
+    response = await client.get(f"/api/profiles/{name}", headers=test_super_admin_token_headers)
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+    response = await client.get(f"/api/profiles/{name}", headers=test_admin_token_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_profile_toggle(client: AsyncClient, test_super_admin_token_headers: dict[str, str]):
+    """测试限时开关只分析匹配路径前缀的请求"""
+    response = await client.put(
+        "/api/profiles", json={"seconds": 60, "path_prefix": "/api/posts"}, headers=test_super_admin_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["active"] is True
+
+    assert "x-profile-id" in (await client.get("/api/posts")).headers
+    assert "x-profile-id" not in (await client.get("/")).headers
+
+    response = await client.delete("/api/profiles", headers=test_super_admin_token_headers)
+    assert response.status_code == 204
+    assert "x-profile-id" not in (await client.get("/api/posts")).headers
+    response = await client.get("/api/profiles", headers=test_super_admin_token_headers)
+    assert response.json()["active"] is False
+    assert response.json()["profiles"]
@@ -3,6 +3,9 @@ import asyncio
 import pytest
 from httpx import AsyncClient
 
+from app import crud
+from app.core.database import async_session
+
 
 @pytest.mark.anyio
 async def test_login_for_access_token(client: AsyncClient):
@@ -44,3 +47,25 @@ async def test_login_for_access_token(client: AsyncClient):
     assert "access_token" in new_token
     assert new_token["token_type"] == "bearer"
     assert new_token["access_token"] != token["access_token"]
+
+
+@pytest.mark.anyio
+async def test_logout(client: AsyncClient):
+    """测试退出登录后访问令牌和刷新令牌均失效，访问令牌不能用于刷新"""
+    response = await client.post("/api/tokens", data={"username": "test_user_2", "password": "123456"})
+    access_token = response.json()["access_token"]
+    refresh_token = response.cookies["refresh_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert (await client.get("/api/users/me", headers=headers)).status_code == 200
+
+    response = await client.put("/api/tokens", headers={"Cookie": f"refresh_token={access_token}"})
+    assert response.status_code == 401
+
+    response = await client.delete("/api/tokens", headers={**headers, "Cookie": f"refresh_token={refresh_token}"})
+    assert response.status_code == 204
+    assert (await client.get("/api/users/me", headers=headers)).status_code == 401
+    response = await client.put("/api/tokens", headers={"Cookie": f"refresh_token={refresh_token}"})
+    assert response.status_code == 401
+
+    async with async_session() as session:
+        assert len(await crud.get_revocations(session=session)) >= 2
@@ -0,0 +1,208 @@
+import asyncio
+import io
+import struct
+import zlib
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+from app import settings
+from app.core.pagination import encode_cursor
+
+
+@pytest.mark.anyio
+async def test_read_current_user(client: AsyncClient, test_user_token_headers: dict[str, str]):
+    """测试获取当前用户信息（缓存的用户快照在更新后失效）"""
+    response = await client.get("/api/users/me")
+    assert response.status_code == 401
+
+    response = await client.get("/api/users/me", headers=test_user_token_headers)
+    assert response.status_code == 200
+    user = response.json()
+    assert user["username"] == "test_user_0"
+
+    # 再次请求命中缓存
+    response = await client.get("/api/users/me", headers=test_user_token_headers)
+    assert response.status_code == 200
+    assert response.json() == user
+
+    # 更新用户后，缓存的快照失效
+    response = await client.patch(
+        f"/api/users/{user['id']}", json={"username": "test_user_0_renamed"}, headers=test_user_token_headers
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/users/me", headers=test_user_token_headers)
+    assert response.json()["username"] == "test_user_0_renamed"
+
+    # 恢复用户名
+    response = await client.patch(
+        f"/api/users/{user['id']}", json={"username": "test_user_0"}, headers=test_user_token_headers
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/users/me", headers=test_user_token_headers)
+    assert response.json()["username"] == "test_user_0"
+
+
+@pytest.mark.anyio
+async def test_read_user_list(client: AsyncClient):
+    """测试获取用户列表（页码模式与游标模式结果一致）"""
+    response = await client.get("/api/users", params={"page": 1, "per_page": 100})
+    assert response.status_code == 200
+    body = response.json()
+    all_ids = [user["id"] for user in body["data"]]
+    assert body["meta"]["total"] == len(all_ids)
+    assert body["meta"]["next_cursor"] is None
+
+    ids = []
+    params = {"per_page": 2}
+    while True:
+        response = await client.get("/api/users", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["data"]) <= 2
+        ids.extend(user["id"] for user in body["data"])
+        if body["meta"]["next_cursor"] is None:
+            break
+        params = {"per_page": 2, "cursor": body["meta"]["next_cursor"]}
+    assert ids == all_ids
+
+    response = await client.get("/api/users", params={"cursor": "invalid"})
+    assert response.status_code == 400
+    # 结构正确但类型错误、超出整数范围的游标
+    for values in ([[1], [2]], [{}, "x"], [True, 1], [1.5, 1], [2**64, 1]):
+        response = await client.get("/api/users", params={"cursor": encode_cursor(*values)})
+        assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_read_user_list_total(client: AsyncClient):
+    """测试用户列表总数（创建用户后更新，可关闭）"""
+    response = await client.get("/api/users", params={"with_total": False})
+    assert response.status_code == 200
+    assert response.json()["meta"]["total"] is None
+    assert response.json()["meta"]["total_pages"] is None
+
+    response = await client.get("/api/users")
+    total = response.json()["meta"]["total"]
+
+    response = await client.post(
+        "/api/users/", json={"username": "test_count_user", "email": "test_count_user@seek2.team", "password": "123456"}
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/users")
+    assert response.json()["meta"]["total"] == total + 1
+
+
+@pytest.mark.anyio
+async def test_read_user_batch(client: AsyncClient):
+    """测试按 ID 批量获取用户（按请求顺序返回，忽略不存在的 ID）"""
+    users = (await client.get("/api/users", params={"per_page": 3})).json()["data"]
+    ids = [user["id"] for user in reversed(users)]
+    response = await client.get("/api/users", params={"ids": ",".join(map(str, [*ids, 999999, ids[0]]))})
+    assert response.status_code == 200
+    body = response.json()
+    assert [user["id"] for user in body["data"]] == ids
+    assert body["meta"]["total"] == len(ids)
+
+    response = await client.get("/api/users", params={"ids": "1,abc"})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_update_user_avatar(client: AsyncClient, test_user_token_headers: dict[str, str]):
+    """测试上传头像（后台处理）"""
+    user = (await client.get("/api/users/me", headers=test_user_token_headers)).json()
+    image = io.BytesIO()
+    Image.new("RGB", (640, 480), color=(30, 120, 200)).save(image, format="PNG")
+
+    response = await client.patch(
+        f"/api/users/{user['id']}/avatar",
+        files={"avatar": ("avatar.png", image.getvalue(), "image/png")},
+        headers=test_user_token_headers,
+    )
+    assert response.status_code == 202
+    task = response.json()
+    assert task["status"] == "pending"
+
+    for _ in range(100):
+        response = await client.get(f"/api/users/{user['id']}/avatar", headers=test_user_token_headers)
+        if response.json()["status"] != "pending":
+            break
+        await asyncio.sleep(0.1)
+    assert response.json() == {"status": "done", "avatar": task["avatar"]}
+
+    response = await client.get("/api/users/me", headers=test_user_token_headers)
+    assert response.json()["avatar"] == task["avatar"]
+    with Image.open(settings.AVATAR_DIR / str(user["id"]) / "tb" / task["avatar"]) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert max(thumbnail.size) == 200
+
+    response = await client.patch(
+        f"/api/users/{user['id']}/avatar",
+        files={"avatar": ("avatar.txt", b"not an image", "text/plain")},
+        headers=test_user_token_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_update_user_avatar_rejected(client: AsyncClient, test_user_token_headers: dict[str, str]):
+    """测试拒绝过大、伪装格式和解压炸弹的头像"""
+    user = (await client.get("/api/users/me", headers=test_user_token_headers)).json()
+    url = f"/api/users/{user['id']}/avatar"
+
+    # 声明为 PNG 的非图片文件
+    response = await client.patch(
+        url, files={"avatar": ("avatar.png", b"<?php echo 'x'; ?>", "image/png")}, headers=test_user_token_headers
+    )
+    assert response.status_code == 400
+
+    # 超过大小限制
+    payload = b"\x89PNG\r\n\x1a\n" + b"\x00" * (settings.MAX_UPLOAD_SIZE + 1)
+    response = await client.patch(
+        url, files={"avatar": ("avatar.png", payload, "image/png")}, headers=test_user_token_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "文件过大"
+
+    # 文件很小但声明的像素尺寸巨大
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+    ihdr = struct.pack(">IIBBBBB", 50000, 50000, 8, 2, 0, 0, 0)
+    bomb = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(b"")) + chunk(b"IEND", b"")
+    response = await client.patch(
+        url, files={"avatar": ("avatar.png", bomb, "image/png")}, headers=test_user_token_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "图片尺寸过大"
+
+
+@pytest.mark.anyio
+async def test_read_user_etag(client: AsyncClient, test_admin_token_headers: dict[str, str]):
+    """测试用户信息的 ETag 与条件请求"""
+    user = (await client.get("/api/users/me", headers=test_admin_token_headers)).json()
+    url = f"/api/users/{user['id']}"
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    response = await client.get(f"/api/users/username/{user['username']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # 更新后缓存失效，ETag 变化
+    response = await client.patch(url, json={"email": "test_admin_etag@seek2.team"}, headers=test_admin_token_headers)
+    assert response.status_code == 200
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["email"] == "test_admin_etag@seek2.team"
+
+    response = await client.get("/api/users/99999")
+    assert response.status_code == 404
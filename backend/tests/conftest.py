@@ -1,9 +1,41 @@
+import os
 from collections.abc import AsyncGenerator
 
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
+from tests.postgres import LocalPostgres, find_bin_dir
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--db",
+        choices=("sqlite", "postgres"),
+        default=os.environ.get("TEST_DB", "sqlite"),
+        help="测试使用的数据库（postgres 需要安装 asyncpg，未设置 DATABASE_URL 时启动本机的 PostgreSQL）",
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    """在导入应用（读取配置）之前选择数据库"""
+    if config.getoption("--db") != "postgres" or os.environ.get("DATABASE_URL"):
+        return
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        raise pytest.UsageError("--db postgres 需要安装 asyncpg")
+    bin_dir = find_bin_dir()
+    if bin_dir is None:
+        raise pytest.UsageError("未找到 PostgreSQL 程序（initdb / pg_ctl），可通过 PG_BIN 指定所在目录")
+    config.local_postgres = LocalPostgres(bin_dir).start()
+    os.environ["DATABASE_URL"] = config.local_postgres.url
+
+
+def pytest_unconfigure(config: pytest.Config):
+    if local_postgres := getattr(config, "local_postgres", None):
+        local_postgres.stop()
+
 
 @pytest.fixture(scope="session")
 def anyio_backend():
@@ -0,0 +1,33 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.core.bus import InvalidationBus, SQLiteBackend
+
+
+@pytest.mark.anyio
+async def test_sqlite_bus(tmp_path: Path):
+    """测试通过 SQLite 通知表在多个工作进程间广播缓存失效"""
+    path = tmp_path / "bus.db"
+    buses = [InvalidationBus(SQLiteBackend(path=path, poll_interval=0.01)) for _ in range(2)]
+    received: list[list[str]] = [[], []]
+    for bus, keys in zip(buses, received, strict=True):
+        bus.subscribe("user", keys.append)
+        await bus.start()
+
+    try:
+        buses[0].publish("user", 1, 2)
+        # 本进程立即处理
+        assert received[0] == ["1", "2"]
+        for _ in range(100):
+            if received[1]:
+                break
+            await asyncio.sleep(0.01)
+        # 其他进程收到消息，发布者不会重复处理自己的消息
+        assert received[1] == ["1", "2"]
+        await asyncio.sleep(0.05)
+        assert received[0] == ["1", "2"]
+    finally:
+        for bus in buses:
+            await bus.stop()
@@ -0,0 +1,19 @@
+import pytest
+
+from app.core.config import ProductionSettings
+
+
+@pytest.mark.anyio
+async def test_production_sqlite_path(tmp_path):
+    """测试生产环境在新位置没有数据库时继续使用旧位置的数据库"""
+    legacy = tmp_path / "legacy.db"
+    options = {"SECRET_KEY": "x", "DATABASE_URL": None, "DATA_DIR": tmp_path / "data", "LEGACY_SQLITE_PATH": legacy}
+    assert ProductionSettings(**options).SQLALCHEMY_DATABASE_URI.endswith("/data/data.db")
+
+    legacy.touch()
+    assert ProductionSettings(**options).SQLALCHEMY_DATABASE_URI.endswith("/legacy.db")
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "data.db").touch()
+    assert ProductionSettings(**options).SQLALCHEMY_DATABASE_URI.endswith("/data/data.db")
+    assert ProductionSettings(**options, SQLITE_PATH=legacy).SQLALCHEMY_DATABASE_URI.endswith("/legacy.db")
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import select
+
+from app import settings
+from app.core.database import after_commit, async_session, unit_of_work
+from app.models import Tag
+
+
+@pytest.mark.anyio
+async def test_unit_of_work():
+    """测试工作单元在结束时提交并执行提交后回调，出错时回滚并丢弃回调"""
+    committed: list[str] = []
+
+    async with unit_of_work() as session:
+        session.add(Tag(name="uow_ok"))
+        await session.flush()
+        after_commit(session, lambda: committed.append("uow_ok"))
+        assert committed == []
+    assert committed == ["uow_ok"]
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work() as session:
+            session.add(Tag(name="uow_fail"))
+            await session.flush()
+            after_commit(session, lambda: committed.append("uow_fail"))
+            raise RuntimeError
+    assert committed == ["uow_ok"]
+
+    async with async_session() as session:
+        result = await session.execute(select(Tag.name).where(Tag.name.in_(["uow_ok", "uow_fail"])))
+        assert list(result.scalars()) == ["uow_ok"]
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"), reason="只读连接路由仅适用于 SQLite")
+async def test_read_write_routing():
+    """测试读写分离：只读会话拒绝写入，工作单元中的读取走读引擎，写入后固定使用写引擎"""
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.database import async_engine, read_engine, read_session
+
+    assert read_engine is not async_engine
+    assert "mode=ro" in str(read_engine.url)
+
+    async with read_session() as session:
+        await session.execute(select(Tag.id).limit(1))
+        with pytest.raises(OperationalError):
+            await session.execute(Tag.__table__.insert().values(name="ro_write"))
+
+    async with unit_of_work() as session:
+        await session.execute(select(Tag.id).limit(1))
+        assert session.get_bind() is read_engine.sync_engine
+        session.add(Tag(name="routed_write"))
+        await session.flush()
+        assert session.get_bind() is async_engine.sync_engine
+        result = await session.execute(select(Tag.name).where(Tag.name == "routed_write"))
+        assert result.scalar_one() == "routed_write"
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"), reason="PRAGMA 仅适用于 SQLite")
+async def test_sqlite_pragmas():
+    """测试读写引擎的新连接都应用了 SQLITE_PRAGMAS，只读连接额外开启 query_only"""
+    from app.core.database import async_engine, read_engine
+
+    # PRAGMA 读取时返回的值（枚举类型返回数字）
+    codes = {"synchronous": {"NORMAL": 1}, "temp_store": {"MEMORY": 2}, "journal_mode": {"WAL": "wal"}}
+    expected = {name: codes.get(name, {}).get(value, value) for name, value in settings.SQLITE_PRAGMAS.items()}
+    for engine, query_only in ((async_engine, 0), (read_engine, 1)):
+        async with engine.connect() as conn:
+            for name, value in {**expected, "query_only": query_only}.items():
+                assert (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar() == value, name
+
+
+@pytest.mark.anyio
+async def test_lagging_reader_pins_writer(monkeypatch):
+    """测试读引擎是可能延迟的外部副本时，工作单元中的读取也走写引擎"""
+    from app.core import database
+
+    monkeypatch.setattr(database, "READER_MAY_LAG", True)
+    async with unit_of_work() as session:
+        await session.execute(select(Tag.id).limit(1))
+        assert session.get_bind() is database.async_engine.sync_engine
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.executors import BoundedExecutor
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+@pytest.mark.anyio
+async def test_bounded_executor():
+    """测试排队达到上限时拒绝新任务（503），成功与失败的任务分别计数"""
+    executor = BoundedExecutor(name="test", workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(executor.run(release.wait))
+        waiting = asyncio.create_task(executor.run(lambda: 1))
+        while executor.running != 1 or executor.waiting != 1:
+            await asyncio.sleep(0.001)
+        assert executor.saturated
+
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(lambda: 2)
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        assert await running is True
+        assert await waiting == 1
+        with pytest.raises(ValueError):
+            await executor.run(_fail)
+        assert executor.stats() == {
+            "workers": 1,
+            "waiting": 0,
+            "running": 0,
+            "completed": 2,
+            "failed": 1,
+            "rejected": 1,
+        }
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.http_cache import ResponseCache
+
+
+@pytest.mark.anyio
+async def test_response_cache_skips_stale_build():
+    """测试生成响应期间相关标签失效时不缓存，无关标签失效不受影响"""
+    cache = ResponseCache(maxsize=10, ttl=60)
+
+    since = cache.generation
+    cache.invalidate("user:1")
+    entry = cache.set("/a", b"old", ["user:1"], since=since)
+    assert entry.body == b"old"
+    assert cache.get("/a") is None
+
+    since = cache.generation
+    cache.invalidate("user:2")
+    cache.set("/a", b"new", ["user:1"], since=since)
+    assert cache.get("/a").body == b"new"
+
+
+@pytest.mark.anyio
+async def test_response_cache_prune_keeps_stats():
+    """测试清理标签索引不计入命中指标"""
+    cache = ResponseCache(maxsize=1, ttl=60)
+    for i in range(4):
+        cache.set(f"/{i}", b"x", [f"tag:{i}"])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+    assert stats["tags"] <= 2
@@ -0,0 +1,82 @@
+import csv
+from pathlib import Path
+
+import pytest
+import ujson
+from sqlalchemy import func, select
+
+from app.core.database import async_session
+from app.core.importer import import_posts, import_users
+from app.core.security import get_password_hash
+from app.models import Post, Tag, User
+
+
+@pytest.mark.anyio
+async def test_import_users_and_posts(tmp_path: Path):
+    """测试批量导入用户（JSONL）和文章（CSV），并自动创建分类与标签"""
+    hashed_password = get_password_hash("123456")
+    users = tmp_path / "users.jsonl"
+    users.write_text(
+        "\n".join(
+            ujson.dumps({"username": f"import_user_{i}", "email": f"import_user_{i}@seek2.team", **password})
+            for i, password in enumerate([{"password": "123456"}] + [{"hashed_password": hashed_password}] * 4)
+        )
+        + "\n"
+        + ujson.dumps({"username": "import_banned", "email": "import_banned@seek2.team", "password": "x", "power": 0})
+    )
+    stats = await import_users(users, batch_size=2)
+    assert (stats.rows, stats.skipped) == (6, 0)
+
+    posts = tmp_path / "posts.csv"
+    with posts.open("w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["title", "content", "author", "author_id", "category", "tags", "created_at"]
+        )
+        writer.writeheader()
+        for i in range(5):
+            writer.writerow(
+                {
+                    "title": f"import_post_{i}",
+                    "content": "imported",
+                    "author": f"import_user_{i % 2}",
+                    "author_id": 1,  # 导出文件中源数据库的用户 ID，以 author 为准
+                    "category": "import_cat",
+                    "tags": "import_a|import_b" if i % 2 else "import_a",
+                    "created_at": 1_600_000_000 + i,
+                }
+            )
+    stats = await import_posts(posts, batch_size=2)
+    assert stats.rows == 5
+
+    async with async_session() as session:
+        user = (await session.execute(select(User).where(User.username == "import_user_1"))).scalar_one()
+        assert (user.hashed_password, user.power) == (hashed_password, 1)
+        banned = (await session.execute(select(User).where(User.username == "import_banned"))).scalar_one()
+        assert banned.power == 0
+        result = await session.execute(
+            select(func.count()).select_from(Post).join(Post.tags).where(Tag.name.in_(["import_a", "import_b"]))
+        )
+        assert result.scalar() == 7
+        post = (await session.execute(select(Post).where(Post.title == "import_post_3"))).scalar_one()
+        assert (post.created_at, post.author_id) == (1_600_000_003, user.id)
+
+
+@pytest.mark.anyio
+async def test_import_resume(tmp_path: Path):
+    """测试导入失败后从最后提交的批次继续"""
+    path = tmp_path / "posts.jsonl"
+    records = [{"title": f"resume_post_{i}", "content": "resume", "author": "test_user_0"} for i in range(6)]
+    records[4]["author"] = "missing_user"
+    path.write_text("\n".join(ujson.dumps(record) for record in records))
+
+    with pytest.raises(ValueError):
+        await import_posts(path, batch_size=2)
+
+    records[4]["author"] = "test_user_0"
+    path.write_text("\n".join(ujson.dumps(record) for record in records))
+    stats = await import_posts(path, batch_size=2)
+    assert (stats.rows, stats.skipped) == (2, 4)
+
+    async with async_session() as session:
+        result = await session.execute(select(func.count(Post.id)).where(Post.title.like("resume_post_%")))
+        assert result.scalar() == 6
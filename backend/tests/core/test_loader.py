@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.core.loader import DataLoader
+
+
+@pytest.mark.anyio
+async def test_data_loader_coalesces():
+    """测试同一轮次的 load 调用合并为一次批量查询，且同一个键只查询一次"""
+    calls: list[list[int]] = []
+
+    async def batch_load(keys: list[int]) -> dict[int, str]:
+        calls.append(keys)
+        return {key: f"user{key}" for key in keys if key != 3}
+
+    loader = DataLoader(batch_load, max_batch_size=2)
+
+    async def fetch(key: int) -> str | None:
+        return await loader.load(key)
+
+    results = await asyncio.gather(fetch(1), fetch(2), fetch(1), fetch(3))
+    assert results == ["user1", "user2", "user1", None]
+    assert calls == [[1, 2], [3]]
+
+    assert await loader.load_many([2, 1]) == ["user2", "user1"]
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_data_loader_serializes_and_cancels():
+    """测试不同轮次的批量查询依次执行，被取消时等待者不会一直挂起，且取消的键可以重新加载"""
+    running = 0
+    max_running = 0
+    release = asyncio.Event()
+
+    async def batch_load(keys: list[int]) -> dict[int, int]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await release.wait()
+            return {key: key for key in keys}
+        finally:
+            running -= 1
+
+    loader = DataLoader(batch_load)
+    first = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(loader.load(2))
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(first, second) == [1, 2]
+    assert max_running == 1
+
+    release.clear()
+    pending = loader.load(3)
+    await asyncio.sleep(0.01)
+    for task in list(loader._tasks):
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+
+    release.set()
+    assert await loader.load(3) == 3
@@ -0,0 +1,41 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app import settings
+
+
+@pytest.mark.anyio
+async def test_read_metrics(client: AsyncClient, monkeypatch):
+    """测试请求指标按路由模板记录，并统计每个请求的 SQL 数量"""
+    monkeypatch.setattr(settings, "METRICS_ALLOW_HOSTS", {"127.0.0.1"})
+    response = await client.get("/api/posts/999999")
+    assert response.status_code == 404
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/api/posts/{id}",status="404"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/posts/{id}",le="+Inf"}' in text
+    assert 'db_queries_per_request_count{method="GET",route="/api/posts/{id}"}' in text
+    assert 'app_component_stat{component="db_pool",stat="size"}' in text
+    assert "app_process_info{pid=" in text
+
+
+@pytest.mark.anyio
+async def test_metrics_access(app: FastAPI, client: AsyncClient, monkeypatch):
+    """测试默认拒绝所有访问（包括本机，可能是同机反向代理），允许列表中的地址直接放行，其他地址需要 Bearer 令牌"""
+    transport = ASGITransport(app=app, client=("10.0.0.1", 1234))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as remote:
+        assert (await client.get("/metrics")).status_code == 403
+        assert (await remote.get("/metrics")).status_code == 403
+
+        monkeypatch.setattr(settings, "METRICS_ALLOW_HOSTS", {"127.0.0.1"})
+        assert (await client.get("/metrics")).status_code == 200
+        assert (await remote.get("/metrics")).status_code == 403
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape")
+        assert (await remote.get("/metrics")).status_code == 401
+        assert (await remote.get("/metrics", headers={"Authorization": "Bearer other"})).status_code == 401
+        assert (await remote.get("/metrics", headers={"Authorization": "Bearer scrape"})).status_code == 200
@@ -0,0 +1,191 @@
+import pytest
+from sqlalchemy import Engine, create_engine, event, inspect, select, text
+
+from app import crud, settings
+from app.core import migrations
+from app.core.database import read_engine, read_session
+from app.core.migrations import MIGRATIONS, Migration, run_migrations
+from app.models import SchemaMigration, Tag, posts_tags
+
+sqlite_only = pytest.mark.skipif(
+    not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"), reason="EXPLAIN QUERY PLAN 仅适用于 SQLite"
+)
+
+
+# 迁移系统引入前（初始版本）的表结构，不随模型变化
+BASELINE_DDL = [
+    """
+    CREATE TABLE categories (
+        id INTEGER NOT NULL,
+        name VARCHAR(10) NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE tags (
+        id INTEGER NOT NULL,
+        name VARCHAR(10) NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL,
+        email VARCHAR(64) NOT NULL,
+        username VARCHAR(32) NOT NULL,
+        hashed_password VARCHAR(64) NOT NULL,
+        avatar VARCHAR(36),
+        power SMALLINT NOT NULL,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (email),
+        UNIQUE (username)
+    )
+    """,
+    """
+    CREATE TABLE posts (
+        id INTEGER NOT NULL,
+        title VARCHAR(64) NOT NULL,
+        content TEXT NOT NULL,
+        author_id INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (title),
+        FOREIGN KEY(author_id) REFERENCES users (id),
+        FOREIGN KEY(category_id) REFERENCES categories (id)
+    )
+    """,
+    """
+    CREATE TABLE posts_tags (
+        post_id INTEGER,
+        tag_id INTEGER,
+        FOREIGN KEY(post_id) REFERENCES posts (id),
+        FOREIGN KEY(tag_id) REFERENCES tags (id)
+    )
+    """,
+]
+BASELINE_TABLES = {"categories", "tags", "users", "posts", "posts_tags"}
+
+
+def _create_legacy_db(path) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for ddl in BASELINE_DDL:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO users VALUES (1, 'a@b.c', 'a', 'x', NULL, 1, 0, 0)"))
+        conn.execute(text("INSERT INTO categories VALUES (1, 'c')"))
+        conn.execute(text("INSERT INTO posts VALUES (1, 'title', 'content', 1, 1, 0, 0)"))
+        conn.execute(text("INSERT INTO tags VALUES (1, 'x'), (2, 'y')"))
+        conn.execute(text("INSERT INTO posts_tags VALUES (1, 1), (1, 1), (1, 2)"))
+    return engine
+
+
+@pytest.mark.anyio
+async def test_run_migrations(tmp_path):
+    """测试迁移旧数据库：补建索引、重建 posts_tags（复合主键并去重）、建立全文索引、分类可为空"""
+    engine = _create_legacy_db(tmp_path / "legacy.db")
+
+    with engine.begin() as conn:
+        assert run_migrations(conn) == [migration.version for migration in MIGRATIONS]
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        assert {"import_checkpoints", "schema_migrations", "token_revocations"} <= set(inspector.get_table_names())
+        assert inspector.get_pk_constraint("posts_tags")["constrained_columns"] == ["post_id", "tag_id"]
+        assert inspector.get_pk_constraint("token_revocations")["constrained_columns"] == ["id"]
+        assert {index["name"] for index in inspector.get_indexes("posts_tags")} == {"ix_posts_tags_tag_id_post_id"}
+        assert {index["name"] for index in inspector.get_indexes("posts")} >= {
+            "ix_posts_created_at_id",
+            "ix_posts_author_id_created_at_id",
+            "ix_posts_category_id_created_at_id",
+        }
+        assert conn.execute(select(posts_tags)).all() == [(1, 1), (1, 2)]
+        # 已有文章建立了全文索引，新文章由触发器同步
+        category_id = next(column for column in inspector.get_columns("posts") if column["name"] == "category_id")
+        assert category_id["nullable"]
+        conn.execute(text("INSERT INTO posts VALUES (2, 'other', 'searchable', 1, NULL, 0, 0)"))
+        match = text("SELECT rowid FROM posts_fts WHERE posts_fts MATCH :q")
+        assert conn.execute(match, {"q": "content"}).scalars().all() == [1]
+        assert conn.execute(match, {"q": "searchable"}).scalars().all() == [2]
+        assert run_migrations(conn) == []
+        assert len(conn.execute(select(SchemaMigration.version)).all()) == len(MIGRATIONS)
+    engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_run_migrations_rollback(tmp_path, monkeypatch):
+    """测试迁移失败时 DDL 一并回滚，不遗留中间表和迁移记录"""
+
+    def fail(_conn):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*MIGRATIONS, Migration(999, "fail", fail)])
+    engine = _create_legacy_db(tmp_path / "legacy.db")
+    with pytest.raises(RuntimeError), engine.begin() as conn:
+        run_migrations(conn)
+
+    with engine.begin() as conn:
+        assert set(inspect(conn).get_table_names()) == BASELINE_TABLES
+        assert conn.execute(text("SELECT count(*) FROM posts_tags")).scalar() == 3
+    engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_run_migrations_fresh(tmp_path):
+    """测试新数据库：按模型建表，所有迁移标记为已执行"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    with engine.begin() as conn:
+        assert run_migrations(conn) == []
+        versions = conn.execute(select(SchemaMigration.version)).scalars().all()
+        assert versions == [migration.version for migration in MIGRATIONS]
+    engine.dispose()
+
+
+async def _explain(conn, statement: str, parameters) -> str:
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in result)
+
+
+@sqlite_only
+@pytest.mark.anyio
+async def test_hot_queries_use_indexes():
+    """EXPLAIN QUERY PLAN 检查列表热点查询使用索引，而不是全表扫描后排序"""
+    cases = [
+        (lambda s: crud.get_user_list(session=s, skip=20), "ix_users_created_at_id"),
+        (lambda s: crud.get_user_list(session=s, after=(0, 1)), "ix_users_created_at_id"),
+        (lambda s: crud.get_post_list(session=s), "ix_posts_created_at_id"),
+        (lambda s: crud.get_post_list(session=s, after=(2**40, 1)), "ix_posts_created_at_id"),
+        (lambda s: crud.get_post_list(session=s, author_id=1, after=(2**40, 1)), "ix_posts_author_id_created_at_id"),
+        (lambda s: crud.get_post_list(session=s, category_id=1), "ix_posts_category_id_created_at_id"),
+        (lambda s: crud.get_post_list(session=s, tag_id=1), "ix_posts_tags_tag_id_post_id"),
+    ]
+    for query, index in cases:
+        captured = []
+
+        def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+            captured.append((statement, parameters))  # noqa: B023
+
+        event.listen(read_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            async with read_session() as session:
+                await query(session)
+        finally:
+            event.remove(read_engine.sync_engine, "before_cursor_execute", capture)
+
+        async with read_engine.connect() as conn:
+            plan = await _explain(conn, *captured[0])
+        assert index in plan, plan
+        for line in plan.splitlines():
+            assert line.strip() not in {"SCAN posts", "SCAN users", "SCAN posts_tags"}, plan
+
+    # 加载文章的标签使用主键 (post_id, tag_id)
+    stmt = select(Tag, posts_tags.c.post_id).join(posts_tags).where(posts_tags.c.post_id.in_([1, 2]))
+    compiled = stmt.compile(read_engine, compile_kwargs={"literal_binds": True})
+    async with read_engine.connect() as conn:
+        plan = await _explain(conn, str(compiled), ())
+    assert "SEARCH posts_tags USING COVERING INDEX sqlite_autoindex_posts_tags_1" in plan, plan
@@ -0,0 +1,155 @@
+import os
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from app.core.static import (
+    MediaAwareGZipMiddleware,
+    PrecompressedStaticFiles,
+    StaticFileResponse,
+    accepts_encoding,
+    precompress_file,
+)
+
+
+@pytest.mark.anyio
+async def test_precompressed_static_files(tmp_path: Path):
+    """测试按 Accept-Encoding 返回预压缩文件，并为带哈希的文件设置永久缓存"""
+    script = b"console.log('hello');\n" * 200
+    (tmp_path / "app.js").write_bytes(script)
+    precompress_file(tmp_path / "app.js")
+    (tmp_path / "avatar_0123456789abcdef0123456789abcdef.png").write_bytes(b"\x89PNG" + b"\0" * 2048)
+    assert (tmp_path / "app.js.gz").exists()
+
+    app = Starlette(routes=[Mount("/static", PrecompressedStaticFiles(directory=tmp_path))])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/javascript")
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == script
+
+        (tmp_path / "app.js.br").write_bytes(b"br")
+        response = await client.get("/static/app.js", headers={"Accept-Encoding": "br;q=0, gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+
+        response = await client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["cache-control"] == "public, no-cache"
+
+        response = await client.get("/static/avatar_0123456789abcdef0123456789abcdef.png")
+        assert "content-encoding" not in response.headers
+        assert "immutable" in response.headers["cache-control"]
+
+        # 原文件比压缩版本新（尚未重新预压缩）时返回原文件
+        updated = b"console.log('updated');\n" * 200
+        (tmp_path / "app.js").write_bytes(updated)
+        mtime = (tmp_path / "app.js.gz").stat().st_mtime + 10
+        os.utime(tmp_path / "app.js", (mtime, mtime))
+        response = await client.get("/static/app.js", headers={"Accept-Encoding": "br, gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.content == updated
+
+
+@pytest.mark.anyio
+async def test_media_aware_gzip():
+    """测试 GZip 中间件只压缩文本类响应"""
+
+    async def text(_request):
+        return Response(b"a" * 4096, media_type="application/json")
+
+    async def media(_request):
+        return Response(b"a" * 4096, media_type="image/webp")
+
+    app = Starlette(
+        routes=[Route("/text", text), Route("/media", media)],
+        middleware=[Middleware(MediaAwareGZipMiddleware, minimum_size=1024)],
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < 4096
+
+        response = await client.get("/media", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.content == b"a" * 4096
+
+
+@pytest.mark.anyio
+async def test_accepts_encoding():
+    """测试 Accept-Encoding 按编码名和 q 值解析，而不是子串匹配"""
+    assert accepts_encoding("gzip, deflate, br", "br")
+    assert accepts_encoding("gzip;q=0.5", "gzip")
+    assert not accepts_encoding("br;q=0, gzip", "br")
+    assert not accepts_encoding("gzip; q=0.0", "gzip")
+    assert not accepts_encoding("x-gzip", "gzip")
+    assert accepts_encoding("*", "br")
+    assert not accepts_encoding("gzip, *;q=0", "br")
+    assert not accepts_encoding("", "gzip")
+
+
+async def _call(app, path: str, headers: dict[str, str]) -> list[dict]:
+    """以支持 pathsend 扩展的服务器调用 ASGI 应用，返回发送的消息"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+        "extensions": {"http.response.pathsend": {}},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.mark.anyio
+async def test_pathsend_through_gzip(tmp_path: Path):
+    """测试 pathsend 经过 GZip 中间件：媒体文件原样转发并带有文件头，文本文件压缩，范围请求由 FileResponse 处理"""
+    image = tmp_path / "image.webp"
+    image.write_bytes(b"RIFF" + b"\0" * 4096)
+    text = tmp_path / "data.json"
+    text.write_bytes(b"[" + b"1," * 2048 + b"1]")
+
+    async def read_image(_request):
+        return StaticFileResponse(image, media_type="image/webp")
+
+    async def read_text(_request):
+        return StaticFileResponse(text, media_type="application/json")
+
+    app = Starlette(
+        routes=[Route("/image", read_image), Route("/text", read_text)],
+        middleware=[Middleware(MediaAwareGZipMiddleware, minimum_size=1024)],
+    )
+    for accept_encoding in ("gzip", "identity"):
+        start, pathsend = await _call(app, "/image", {"Accept-Encoding": accept_encoding})
+        headers = {name.decode(): value.decode() for name, value in start["headers"]}
+        assert pathsend == {"type": "http.response.pathsend", "path": str(image)}
+        assert headers["content-length"] == "4100"
+        assert {"etag", "last-modified"} <= headers.keys()
+
+    start, body = await _call(app, "/text", {"Accept-Encoding": "gzip"})
+    assert (dict(start["headers"])[b"content-encoding"], body["type"]) == (b"gzip", "http.response.body")
+
+    start, *_ = await _call(app, "/image", {"Range": "bytes=0-3"})
+    assert start["status"] == 206
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+from jose import jwt
+from sqlalchemy import select, update
+
+from app import crud
+from app.core.database import unit_of_work
+from app.core.revocations import BloomFilter, RevocationList
+from app.core.security import create_access_token, verify_token
+from app.core.tokens import KeyRing, decode_jwt, encode_jwt, keyring
+from app.models import TokenRevocation
+from app.schemas.tokens import TokenData
+
+
+@pytest.mark.anyio
+async def test_jwt_compatible_with_jose():
+    """测试自实现的 HS256 与 python-jose 互相兼容"""
+    keyring = KeyRing("1", "secret")
+    payload = {"sub": "1", "power": 1, "exp": int(time.time()) + 60}
+    token = encode_jwt(payload, keyring)
+    assert jwt.get_unverified_header(token)["kid"] == "1"
+    assert jwt.decode(token, "secret", algorithms=["HS256"]) == payload
+    assert decode_jwt(jwt.encode(payload, "secret", algorithm="HS256"), keyring) == payload  # 没有 kid 的旧令牌
+
+
+@pytest.mark.anyio
+async def test_jwt_key_rotation_and_rejection():
+    """测试密钥轮换后旧令牌仍可验证，篡改、过期、未知密钥和其他算法的令牌被拒绝"""
+    old = KeyRing("1", "old-secret")
+    token = encode_jwt({"sub": "1", "exp": int(time.time()) + 60}, old)
+    rotated = KeyRing("2", "new-secret", {"1": "old-secret"})
+    assert decode_jwt(token, rotated)["sub"] == "1"
+    assert decode_jwt(encode_jwt({"sub": "2"}, rotated), rotated) == {"sub": "2"}
+    assert decode_jwt(token, KeyRing("2", "new-secret")) is None
+
+    header, payload, signature = token.split(".")
+    forged = encode_jwt({"sub": "2", "exp": int(time.time()) + 60}, KeyRing("1", "other")).split(".")[1]
+    assert decode_jwt(f"{header}.{forged}.{signature}", old) is None
+    assert decode_jwt(encode_jwt({"sub": "1", "exp": int(time.time()) - 1}, old), old) is None
+    assert decode_jwt(jwt.encode({"sub": "1"}, "old-secret", algorithm="HS512"), old) is None
+    assert decode_jwt("not.a.token", old) is None
+    assert decode_jwt("令牌", old) is None
+
+
+@pytest.mark.anyio
+async def test_revocation_list():
+    """测试布隆过滤器无漏判，吊销列表精确判断、扩容并清理过期记录"""
+    bloom = BloomFilter(100, 0.01)
+    keys = [f"key{i}" for i in range(100)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert sum(f"other{i}" in bloom for i in range(1000)) < 50
+
+    revocations = RevocationList(capacity=10, error_rate=0.01, sync_seconds=60)
+    now = int(time.time())
+    for i in range(30):  # 超出容量后重建
+        revocations.apply(f"jti{i}|{now + 60}")
+    revocations.add("expired", now - 1)
+    assert all(revocations.is_revoked(f"jti{i}") for i in range(30))
+    assert not revocations.is_revoked("jti30")
+    assert not revocations.is_revoked("expired")
+    assert not revocations.is_revoked(None)
+    assert revocations.stats()["revoked"] == 30
+
+    revocations._expires["jti0"] = now - 1
+    revocations.prune()
+    assert not revocations.is_revoked("jti0")
+    assert revocations.is_revoked("jti1")
+
+
+@pytest.mark.anyio
+async def test_verify_token_type():
+    """测试访问令牌与刷新令牌不能互换，没有 typ 的旧令牌只能作为刷新令牌"""
+    access_token = create_access_token({"sub": "1", "power": 1})
+    assert verify_token(access_token) is not None
+    assert verify_token(access_token, "refresh") is None
+
+    legacy = encode_jwt({"sub": "1", "power": 1, "exp": int(time.time()) + 60}, keyring)
+    assert verify_token(legacy) is None
+    assert verify_token(legacy, "refresh") is not None
+
+
+@pytest.mark.anyio
+async def test_revocation_sync():
+    """测试按自增 ID 增量同步，写入时间戳或 ID 早于上次同步的记录（晚提交的事务）也不会遗漏"""
+    revocations = RevocationList(capacity=10, error_rate=0.01, sync_seconds=60, id_window=10)
+    await revocations.sync()
+    now = int(time.time())
+
+    async with unit_of_work() as session:
+        await crud.revoke_tokens(session=session, tokens=[TokenData(id=1, power=1, exp=now + 60, jti="sync_late")])
+        stmt = update(TokenRevocation).where(TokenRevocation.jti == "sync_late").values(created_at=now - 3600)
+        await session.execute(stmt)
+    await revocations.sync()
+    assert revocations.is_revoked("sync_late")
+
+    # 重复吊销同一令牌被忽略
+    async with unit_of_work() as session:
+        await crud.revoke_tokens(session=session, tokens=[TokenData(id=1, power=1, exp=now + 60, jti="sync_late")])
+    await revocations.sync()
+    assert revocations.is_revoked("sync_late")
+
+    # 序列 ID 在插入时分配：ID 较小的记录在更大的 ID 同步之后才提交
+    async with unit_of_work() as session:
+        tokens = [TokenData(id=1, power=1, exp=now + 60, jti=jti) for jti in ("sync_early", "sync_next")]
+        await crud.revoke_tokens(session=session, tokens=tokens)
+        early = await session.scalar(select(TokenRevocation).where(TokenRevocation.jti == "sync_early"))
+        early_id = early.id
+        await session.delete(early)
+    await revocations.sync()
+    assert not revocations.is_revoked("sync_early")
+    async with unit_of_work() as session:
+        session.add(TokenRevocation(id=early_id, jti="sync_early", expires_at=now + 60))
+    await revocations.sync()
+    assert revocations.is_revoked("sync_early")
@@ -0,0 +1,64 @@
+"""测试用的临时 PostgreSQL 实例
+
+`pytest --db postgres`（或环境变量 TEST_DB=postgres）时，用本机的 PostgreSQL 程序在临时目录中
+初始化并启动一个实例，测试结束后停止并删除；已设置 DATABASE_URL 时直接使用该数据库。
+"""
+
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from pathlib import Path
+
+
+def find_bin_dir() -> Path | None:
+    """查找 initdb / pg_ctl 所在目录：PG_BIN 环境变量、PATH、pg_config、常见安装位置"""
+    candidates = [os.environ.get("PG_BIN")]
+    if initdb := shutil.which("initdb"):
+        candidates.append(str(Path(initdb).parent))
+    if pg_config := shutil.which("pg_config"):
+        result = subprocess.run([pg_config, "--bindir"], capture_output=True, text=True)
+        candidates.append(result.stdout.strip())
+    candidates += sorted(glob.glob("/usr/lib/postgresql/*/bin"), reverse=True)
+    candidates += sorted(glob.glob("/opt/homebrew/opt/postgresql*/bin"), reverse=True)
+    for candidate in filter(None, candidates):
+        if (Path(candidate) / "initdb").exists() and (Path(candidate) / "pg_ctl").exists():
+            return Path(candidate)
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalPostgres:
+    def __init__(self, bin_dir: Path):
+        self.bin_dir = bin_dir
+        self.root = Path(tempfile.mkdtemp(prefix="fastcms-pg-"))
+        self.data_dir = self.root / "data"
+        self.port = _free_port()
+
+    @property
+    def url(self) -> str:
+        return f"postgresql+asyncpg://postgres@127.0.0.1:{self.port}/postgres"
+
+    def _run(self, *args: str) -> None:
+        subprocess.run([str(self.bin_dir / args[0]), *args[1:]], check=True, capture_output=True)
+
+    def start(self) -> "LocalPostgres":
+        self._run("initdb", "-D", str(self.data_dir), "-U", "postgres", "--auth=trust", "-E", "UTF8", "--no-locale")
+        options = f"-p {self.port} -k {self.root} -c listen_addresses=127.0.0.1 -c fsync=off"
+        self._run(
+            "pg_ctl", "-D", str(self.data_dir), "-o", options, "-l", str(self.root / "postgres.log"), "-w", "start"
+        )
+        return self
+
+    def stop(self) -> None:
+        try:
+            self._run("pg_ctl", "-D", str(self.data_dir), "-m", "immediate", "-w", "stop")
+        finally:
+            shutil.rmtree(self.root, ignore_errors=True)
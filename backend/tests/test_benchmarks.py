@@ -0,0 +1,40 @@
+import argparse
+
+import pytest
+
+from app import settings
+from benchmarks.run import Result, compare, main, percentile
+
+
+@pytest.mark.anyio
+async def test_percentile():
+    """测试按最近秩法取分位数"""
+    values = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 0.1) == 10.0
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.95) == 100.0
+    assert percentile(values, 0.99) == 100.0
+    assert percentile([7.0], 0.5) == 7.0
+
+
+@pytest.mark.anyio
+async def test_compare():
+    """测试与基线比较：超出容差的 p95 变慢、吞吐量下降以及错误响应视为回退，恰好在容差边界不算"""
+    baseline = {"list": {"p95_ms": 10.0, "rps": 100.0}}
+
+    def result(*, errors: int = 0, rps: float = 100.0, p95_ms: float = 10.0) -> Result:
+        return Result(requests=100, errors=errors, rps=rps, p50_ms=5.0, p95_ms=p95_ms, p99_ms=20.0)
+
+    assert compare({"list": result(p95_ms=12.5, rps=75.0)}, baseline, 0.25) == []
+    assert compare({"list": result(p95_ms=12.6)}, baseline, 0.25) == ["list: p95 12.6ms > 基线 10.0ms"]
+    assert compare({"list": result(rps=74.9)}, baseline, 0.25) == ["list: 吞吐量 74.9/s < 基线 100.0/s"]
+    # 没有基线的场景只检查错误响应
+    assert compare({"new": result(errors=3, p95_ms=1000.0)}, baseline, 0.25) == ["new: 3 个错误响应"]
+
+
+@pytest.mark.anyio
+async def test_refuses_persistent_database(monkeypatch):
+    """测试不会在启动时不重建数据库的环境中写入测试数据"""
+    monkeypatch.setattr(settings, "DB_RESET_ON_START", False)
+    assert await main(argparse.Namespace()) == 2